@@ -314,7 +314,7 @@ async def change_styles(
             
             # Generate new style
             print(f"[GENERATING] Applying style '{style_id}' to transcript...")
-            result = await apply_styles(transcript_json, style_id)
+            result = await apply_styles(transcript_json, style_id, render_key=str(video.id))
             print(f"[GENERATED] Style result: {len(str(result))} chars")
             
             # Create new style in database
@@ -382,6 +382,9 @@ def create_render_job(
 
     video = crud.get_video(db, video_id)
     style = crud.get_style(db, video.style_id)
+    # Remotion takes whole-number fps; derive the frame count from the same value
+    # so NTSC rates (29.97, 23.976) don't stretch the composition
+    fps = round(video.fps)
 
     job = RenderJob(
         id=uuid.uuid4(),
@@ -394,8 +397,8 @@ def create_render_job(
             "videoInfo": {
                 "width": math.floor(video.width),
                 "height": math.floor(video.height),
-                "fps": math.floor(video.fps),
-                "durationInFrames": math.floor(video.duration * video.fps)
+                "fps": fps,
+                "durationInFrames": math.floor(video.duration * fps)
             },
             "captionPadding": video.caption_padding,
             "style" : video.current_style['id']
@@ -1,18 +1,32 @@
 # backend/server.py
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from backend.database import engine, Base
 from backend.routers import auth, users, videos, styles, uploads, payments, referral
 from backend.config import settings
+from subtitle_generator.pipeline import SubtitlePipeline
+from subtitle_generator.response_cache import close_response_caches
 
 # Create database tables
 Base.metadata.create_all(bind=engine)
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    # Close the LLM connection pools shared across subtitle runs
+    await SubtitlePipeline.shutdown()
+    await close_response_caches()
+
+
 app = FastAPI(
     title="Video Editor API",
     description="API for video editing with transcript and styles",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # CORS
@@ -1,33 +1,166 @@
 # async_llm_client.py (Updated with post-processing)
 import asyncio
 import logging
-from typing import Optional, Type, Any, List, Tuple
+from typing import Optional, Type, Any, AsyncIterator, List, Tuple, Dict
+import anyio
+import openai
 from openai import AsyncOpenAI, OpenAI
 import httpx
+import orjson
+from openai.lib._pydantic import to_strict_json_schema
+from tenacity import AsyncRetrying, retry_if_exception_type, stop_after_attempt, wait_random_exponential
 import time
 import os
-from subtitle_generator.models import GroupDivision, SubtitleTimeline
-from subtitle_generator.utils.post_processor import GroupPostProcessor  # NEW
+import weakref
+from functools import lru_cache
+from subtitle_generator.models import FontConfig, GroupDivision, SubtitleTimeline
+from subtitle_generator.io_handler import IO_BUFFER_SIZE
+from subtitle_generator.response_cache import make_cache_key
+from subtitle_generator.prompts import (
+    STEP1_USER_TMPL, STEP2_USER_TMPL, HYBRID_STEP1_USER_TMPL, SINGLE_STEP_USER_TMPL
+)
+from subtitle_generator.utils.post_processor import GroupPostProcessor, divide_groups  # NEW
 from subtitle_generator.utils.hybrid_line_divider import HybridLineDivider, HybridPostProcessor
 
 logger = logging.getLogger(__name__)
 
+# Transient failures worth retrying; anything else surfaces immediately
+RETRYABLE_ERRORS = (
+    openai.APIConnectionError,  # includes APITimeoutError
+    openai.RateLimitError,
+    openai.InternalServerError,
+)
+
+
+@lru_cache(maxsize=None)
+def json_schema_format(response_format: Type[Any]) -> dict:
+    """Strict json_schema response_format for a pydantic model, built once per class."""
+    return {
+        "type": "json_schema",
+        "json_schema": {
+            "name": response_format.__name__,
+            "schema": to_strict_json_schema(response_format),
+            "strict": True,
+        },
+    }
+
+
+@lru_cache(maxsize=128)
+def _prompt_cache_key(system_prompt: str, response_format: Optional[Type[Any]]) -> str:
+    """
+    Stable routing key for OpenAI prompt caching.
+    Calls sharing a system prompt (the static prefix) and schema land on the same
+    cache shard, so the prefix is served from cache instead of re-prefilled.
+    """
+    return make_cache_key("prefix", system_prompt, "", response_format)[:32]
+
+
+@lru_cache(maxsize=32)
+def _get_group_post_processor(max_words_per_group: int) -> GroupPostProcessor:
+    """Shared two-step post-processor; it holds no per-batch state."""
+    return GroupPostProcessor(max_words_per_group=max_words_per_group)
+
+
+@lru_cache(maxsize=32)
+def _get_hybrid_tools(
+    max_words_per_group: int,
+    max_words_per_line: int,
+    font_config: Optional[FontConfig]
+) -> Tuple[HybridPostProcessor, HybridLineDivider]:
+    """Shared hybrid (post_processor, line_divider) pair per settings combination."""
+    post_processor = HybridPostProcessor(max_words_per_group=max_words_per_group)
+    line_divider = HybridLineDivider(
+        max_words_per_line=max_words_per_line,
+        font_config=font_config
+    )
+    return post_processor, line_divider
+
+
+def _append_training_example(path: str, kwargs: dict, result: Any) -> None:
+    """Append one call as a chat-format fine-tuning example (OpenAI JSONL)."""
+    content = result.model_dump_json() if hasattr(result, "model_dump_json") else result
+    line = orjson.dumps({"messages": [
+        {"role": "system", "content": kwargs["system_prompt"]},
+        {"role": "user", "content": kwargs["user_prompt"]},
+        {"role": "assistant", "content": content},
+    ]})
+    with open(path, "ab") as f:
+        f.write(line + b"\n")
+
+
+class TokenBucket:
+    """Client-side token bucket used to pace calls under the API rate limits."""
+
+    def __init__(self, rate_per_sec: float, burst: float):
+        self.rate = rate_per_sec
+        self.capacity = burst
+        self.tokens = burst
+        self.last_refill = time.monotonic()
+
+    async def acquire(self, tokens: float = 1) -> None:
+        """Reserve tokens, sleeping until the bucket would have refilled enough."""
+        tokens = min(tokens, self.capacity)
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.last_refill) * self.rate)
+        self.last_refill = now
+
+        # Reserve up front so later callers queue behind this one
+        self.tokens -= tokens
+        if self.tokens < 0:
+            await asyncio.sleep(-self.tokens / self.rate)
+
+
+# Buckets are shared per (kind, model, api_key) since the quota is enforced per key
+_BUCKETS: Dict[Tuple[str, str, str], TokenBucket] = {}
+
+
+def _get_bucket(kind: str, model: str, api_key: str, per_minute: float) -> TokenBucket:
+    key = (kind, model, api_key)
+    if key not in _BUCKETS:
+        rate = per_minute / 60.0
+        # Allow bursts of up to ~10s worth of quota
+        _BUCKETS[key] = TokenBucket(rate_per_sec=rate, burst=max(1.0, rate * 10))
+    return _BUCKETS[key]
+
 
 class AsyncLLMClient:
     """Async OpenAI client with proper timeouts and connection limits."""
     
+    # Shared clients per event loop, keyed by construction args, so runs reuse warm
+    # keep-alive pools; httpx connections can't cross loops, hence the outer key
+    _CLIENT_CACHE: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[tuple, AsyncLLMClient]]" = (
+        weakref.WeakKeyDictionary()
+    )
+    
     def __init__(
         self,
         api_key: str,
         model: str = "gpt-5.1",
         max_concurrent: int = 3,
         max_retries: int = 3,
-        timeout: float = 60.0
+        timeout: float = 60.0,
+        max_response_bytes: int = 1 << 20,
+        requests_per_minute: Optional[float] = 500,
+        tokens_per_minute: Optional[float] = 500_000,
+        response_cache: Optional[Any] = None,
+        base_url: Optional[str] = None
     ):
         self.model = model
         self.max_retries = max_retries
-        self.semaphore = asyncio.Semaphore(max_concurrent)
+        self.limiter = anyio.CapacityLimiter(max_concurrent)
         self.timeout = timeout
+        self.max_response_bytes = max_response_bytes  # Guard against runaway completions
+        self.response_cache = response_cache  # Optional get/set store keyed by prompt hash
+
+        # Client-side admission control to avoid hitting 429s (None disables)
+        self.rpm_bucket = (
+            _get_bucket("rpm", model, api_key, requests_per_minute)
+            if requests_per_minute else None
+        )
+        self.tpm_bucket = (
+            _get_bucket("tpm", model, api_key, tokens_per_minute)
+            if tokens_per_minute else None
+        )
         
         # Configure httpx client with limits and timeouts
         limits = httpx.Limits(
@@ -43,71 +176,374 @@ class AsyncLLMClient:
             pool=10.0
         )
         
+        # HTTP/2 multiplexes the concurrent chunk requests over one shared connection
         http_client = httpx.AsyncClient(
             limits=limits,
-            timeout=timeout_config
+            timeout=timeout_config,
+            http2=True
         )
         
         self.client = AsyncOpenAI(
             api_key=api_key,
+            base_url=base_url,  # None falls back to OPENAI_BASE_URL / api.openai.com
             http_client=http_client,
             timeout=timeout
         )
+        # Set when handed out by get_or_create: the loop's client dict, key and refcount
+        self._loop_clients: Optional[Dict[tuple, "AsyncLLMClient"]] = None
+        self._cache_key: Optional[tuple] = None
+        self._refcount = 0
+    
+    @classmethod
+    def get_or_create(
+        cls,
+        api_key: str,
+        model: str = "gpt-5.1",
+        response_cache: Optional[Any] = None,
+        **kwargs
+    ) -> "AsyncLLMClient":
+        """
+        Return the running loop's shared client for these settings; pair every call
+        with release(). Must be called from inside the loop that will use the client.
+        """
+        loop_clients = cls._CLIENT_CACHE.setdefault(asyncio.get_running_loop(), {})
+        key = (api_key, model, response_cache, tuple(sorted(kwargs.items())))
+        client = loop_clients.get(key)
+        if client is None:
+            client = cls(api_key=api_key, model=model, response_cache=response_cache, **kwargs)
+            client._loop_clients = loop_clients
+            client._cache_key = key
+            loop_clients[key] = client
+        client._refcount += 1
+        return client
+    
+    async def release(self, close_idle: bool = False):
+        """
+        Drop one reference. Idle shared clients stay open for the next run on this
+        loop unless close_idle is set (e.g. the loop is about to end).
+        """
+        if self._cache_key is None:
+            await self.close()
+            return
+        
+        self._refcount -= 1
+        if self._refcount == 0 and close_idle:
+            if self._loop_clients.get(self._cache_key) is self:
+                del self._loop_clients[self._cache_key]
+            await self.close()
+    
+    @classmethod
+    async def shutdown(cls):
+        """Close every shared client of the running loop (app teardown)."""
+        loop_clients = cls._CLIENT_CACHE.pop(asyncio.get_running_loop(), {})
+        for client in list(loop_clients.values()):
+            await client.close()
     
     async def generate(
         self,
         system_prompt: str,
         user_prompt: str,
         response_format: Optional[Type[Any]] = None,
-        chunk_id: Optional[int] = None
+        chunk_id: Optional[int] = None,
+        model: Optional[str] = None,
+        max_output_tokens: Optional[int] = None,
+        prediction: Optional[str] = None
     ) -> Any:
-        """Generate with semaphore control and proper error handling."""
-        async with self.semaphore:
-            messages = [
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_prompt}
-            ]
-            
+        """Generate under the concurrency limiter, retrying transient API errors."""
+        model = model or self.model
+        # Static system prompt first, per-chunk content last: OpenAI caches the shared prefix
+        messages = [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": user_prompt}
+        ]
+        
+        # Serve replays of identical calls from the response cache
+        cache_key = None
+        if self.response_cache:
+            cache_key = make_cache_key(model, system_prompt, user_prompt, response_format)
+            cached = await self.response_cache.get(cache_key)
+            if cached is not None:
+                logger.info("[Chunk %s] Served from response cache", chunk_id)
+                return self._decode(cached.decode("utf-8"), response_format)
+        
+        # Rough token estimate (~4 chars per token) for TPM pacing
+        estimated_tokens = (len(system_prompt) + len(user_prompt)) // 4
+        
+        async with self.limiter:
             start_time = time.time()
-            logger.info(f"[Chunk {chunk_id}] Starting API call...")
+            logger.info("[Chunk %s] Starting API call (%s)...", chunk_id, model)
 
-            print(messages)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("[Chunk %s] Messages: %s", chunk_id, messages)
             
-            for attempt in range(self.max_retries):
-                try:
-                    if response_format:
-                        completion = await self.client.chat.completions.parse(
-                            model=self.model,
-                            messages=messages,
-                            response_format=response_format,
-                        )
-                        result = completion.choices[0].message.parsed
-                    else:
-                        completion = await self.client.chat.completions.create(
-                            model=self.model,
-                            messages=messages
+            try:
+                content = await self._do_call(
+                    messages, response_format, estimated_tokens, chunk_id, model, max_output_tokens,
+                    prediction
+                )
+                result = self._decode(content, response_format)
+            except Exception as e:
+                logger.error("[Chunk %s] Failed: %s", chunk_id, e)
+                raise
+            
+            elapsed = time.time() - start_time
+            logger.info("[Chunk %s] Completed in %.1fs", chunk_id, elapsed)
+        
+        if cache_key:
+            await self.response_cache.set(cache_key, content.encode("utf-8"))
+        return result
+
+    @staticmethod
+    def _decode(content: str, response_format: Optional[Type[Any]]) -> Any:
+        """Turn raw completion content into the requested result type."""
+        if response_format:
+            # Decode the raw JSON ourselves instead of the SDK's parse() round-trip;
+            # FastModel subclasses route this through orjson
+            return response_format.model_validate_json(content)
+        return content
+
+    def select_model(self, text: str, config: Any) -> str:
+        """Pick the cheaper config.small_model for short chunks, else the main model."""
+        small_model = getattr(config, 'small_model', None)
+        if small_model and len(text.split()) < getattr(config, 'small_model_max_words', 25):
+            return small_model
+        return self.model
+
+    async def _generate_routed(self, text: str, config: Any, **kwargs) -> Any:
+        """generate() on the model routed for `text`, retrying on the main model if its output fails validation."""
+        per_word = getattr(config, 'output_tokens_per_word', None)
+        if per_word:
+            kwargs['max_output_tokens'] = 256 + len(text.split()) * per_word
+        
+        # Re-renders of the same video: the previous output for this chunk is a near-exact prediction
+        prediction = None
+        prediction_key = None
+        render_key = getattr(config, 'render_key', None)
+        if render_key and self.response_cache:
+            prediction_key = make_cache_key(
+                "prediction:" + render_key,
+                kwargs['system_prompt'],
+                str(kwargs.get('chunk_id')),
+                kwargs.get('response_format')
+            )
+            prior = await self.response_cache.get(prediction_key)
+            if prior is not None:
+                prediction = prior.decode("utf-8")
+        prediction_models = tuple(getattr(config, 'prediction_models', ()))
+        
+        def call_kwargs(model: str) -> dict:
+            """kwargs for one attempt; predicted outputs are model-gated and reject max_completion_tokens."""
+            if prediction is None or not model.startswith(prediction_models):
+                return kwargs
+            return {**kwargs, 'prediction': prediction, 'max_output_tokens': None}
+        
+        model = self.select_model(text, config)
+        result = None
+        if model != self.model:
+            try:
+                result = await self.generate(model=model, **call_kwargs(model))
+            except ValueError as e:  # pydantic ValidationError / malformed JSON
+                logger.warning(
+                    "[Chunk %s] %s output failed validation (%s), falling back to %s",
+                    kwargs.get('chunk_id'), model, e, self.model
+                )
+        if result is None:
+            result = await self.generate(**call_kwargs(self.model))
+        
+        if prediction_key:
+            await self.response_cache.set(prediction_key, result.model_dump_json().encode("utf-8"))
+        
+        training_data_path = getattr(config, 'training_data_path', None)
+        if training_data_path:
+            await asyncio.to_thread(_append_training_example, training_data_path, kwargs, result)
+        return result
+
+    async def _do_call(
+        self,
+        messages: List[dict],
+        response_format: Optional[Type[Any]],
+        estimated_tokens: int,
+        chunk_id: Optional[int] = None,
+        model: Optional[str] = None,
+        max_output_tokens: Optional[int] = None,
+        prediction: Optional[str] = None
+    ) -> str:
+        """Single API call wrapped in the shared retry policy; returns raw content."""
+        def log_retry(retry_state):
+            logger.warning(
+                "[Chunk %s] Attempt %d failed: %s, retrying in %.1fs...",
+                chunk_id,
+                retry_state.attempt_number,
+                retry_state.outcome.exception(),
+                retry_state.next_action.sleep
+            )
+
+        retrying = AsyncRetrying(
+            wait=wait_random_exponential(multiplier=1, max=30),
+            stop=stop_after_attempt(self.max_retries),
+            retry=retry_if_exception_type(RETRYABLE_ERRORS),
+            before_sleep=log_retry,
+            reraise=True
+        )
+        
+        async for attempt in retrying:
+            with attempt:
+                if self.rpm_bucket:
+                    await self.rpm_bucket.acquire(1)
+                if self.tpm_bucket:
+                    await self.tpm_bucket.acquire(estimated_tokens)
+                
+                content = await self._stream_text(
+                    messages,
+                    json_schema_format(response_format) if response_format else None,
+                    prompt_cache_key=_prompt_cache_key(messages[0]["content"], response_format),
+                    model=model,
+                    max_output_tokens=max_output_tokens,
+                    prediction=prediction
+                )
+        return content
+
+    async def _stream_text(
+        self,
+        messages: List[dict],
+        response_format: Optional[dict] = None,
+        prompt_cache_key: Optional[str] = None,
+        model: Optional[str] = None,
+        max_output_tokens: Optional[int] = None,
+        prediction: Optional[str] = None
+    ) -> str:
+        """Stream a completion, accumulating content deltas into one string."""
+        buffer = []
+        async for delta in self._stream_deltas(
+            messages, response_format, prompt_cache_key, model, max_output_tokens, prediction
+        ):
+            buffer.append(delta)
+        return "".join(buffer)
+
+    async def _stream_deltas(
+        self,
+        messages: List[dict],
+        response_format: Optional[dict] = None,
+        prompt_cache_key: Optional[str] = None,
+        model: Optional[str] = None,
+        max_output_tokens: Optional[int] = None,
+        prediction: Optional[str] = None
+    ) -> AsyncIterator[str]:
+        """Yield completion content deltas as they arrive, enforcing max_response_bytes."""
+        received = 0
+        extra = {"response_format": response_format} if response_format else {}
+        if prompt_cache_key:
+            extra["prompt_cache_key"] = prompt_cache_key
+        if max_output_tokens:
+            extra["max_completion_tokens"] = max_output_tokens
+        if prediction:
+            # Predicted outputs: tokens matching the previous render are not re-decoded
+            extra["prediction"] = {"type": "content", "content": prediction}
+        stream = await self.client.chat.completions.create(
+            model=model or self.model,
+            messages=messages,
+            stream=True,
+            **extra
+        )
+        try:
+            async for chunk in stream:
+                if not chunk.choices:
+                    continue
+                if chunk.choices[0].finish_reason == "length":
+                    # Truncated JSON would only fail later with a less useful parse error
+                    if max_output_tokens:
+                        raise ValueError(f"Completion hit the {max_output_tokens}-token output cap")
+                    raise ValueError("Completion hit the model's output token limit")
+                delta = chunk.choices[0].delta.content
+                if delta:
+                    received += len(delta.encode("utf-8"))
+                    if received > self.max_response_bytes:
+                        raise ValueError(
+                            f"Completion exceeded {self.max_response_bytes} bytes, aborting stream"
                         )
-                        result = completion.choices[0].message.content
-                    
-                    elapsed = time.time() - start_time
-                    logger.info(f"[Chunk {chunk_id}] Completed in {elapsed:.1f}s")
-                    return result
-                    
-                except asyncio.TimeoutError:
-                    logger.error(f"[Chunk {chunk_id}] Timeout after {self.timeout}s")
-                    raise
-                except Exception as e:
-                    wait_time = min(30, (2 ** attempt) + (hash(chunk_id) % 10) / 10)
-                    logger.warning(
-                        f"[Chunk {chunk_id}] Attempt {attempt + 1} failed: {e}, "
-                        f"retrying in {wait_time:.1f}s..."
-                    )
-                    
-                    if attempt < self.max_retries - 1:
-                        await asyncio.sleep(wait_time)
-                    else:
-                        logger.error(f"[Chunk {chunk_id}] All retries exhausted")
-                        raise e
+                    yield delta
+        except httpx.TimeoutException as e:
+            # The SDK only wraps the initial request; mid-stream transport failures
+            # surface raw, so map them onto the retryable API errors
+            raise openai.APITimeoutError(request=stream.response.request) from e
+        except httpx.TransportError as e:
+            raise openai.APIConnectionError(request=stream.response.request) from e
+        finally:
+            await stream.close()
+
+    async def generate_batch(
+        self,
+        requests: List[Tuple[str, str, Optional[Type[Any]]]],
+        poll_interval: float = 30.0
+    ) -> List[Any]:
+        """
+        Run (system_prompt, user_prompt, response_format) requests through the OpenAI
+        Batch API: ~50% cheaper and outside realtime rate limits, but results can take
+        up to 24h. Identical requests are submitted once.
+        """
+        keys = []
+        lines: Dict[str, bytes] = {}
+        for system_prompt, user_prompt, response_format in requests:
+            key = make_cache_key(self.model, system_prompt, user_prompt, response_format)
+            keys.append(key)
+            if key in lines:
+                continue
+            body = {
+                "model": self.model,
+                "messages": [
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": user_prompt}
+                ],
+            }
+            if response_format:
+                body["response_format"] = json_schema_format(response_format)
+            lines[key] = orjson.dumps(
+                {"custom_id": key, "method": "POST", "url": "/v1/chat/completions", "body": body}
+            )
+        
+        batch_file = await self.client.files.create(
+            file=("subtitle_batch.jsonl", b"\n".join(lines.values())),
+            purpose="batch"
+        )
+        batch = await self.client.batches.create(
+            input_file_id=batch_file.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h"
+        )
+        logger.info(
+            "Submitted batch %s with %d requests (%d duplicates folded)",
+            batch.id, len(lines), len(requests) - len(lines)
+        )
+        
+        while batch.status not in ("completed", "failed", "expired", "cancelled"):
+            await asyncio.sleep(poll_interval)
+            batch = await self.client.batches.retrieve(batch.id)
+        
+        if batch.status != "completed" or not batch.output_file_id:
+            raise RuntimeError(f"Batch {batch.id} ended with status {batch.status}")
+        
+        output = await self.client.files.content(batch.output_file_id)
+        contents: Dict[str, str] = {}
+        for line in output.content.splitlines():
+            if not line:
+                continue
+            record = orjson.loads(line)
+            response = record.get("response") or {}
+            if response.get("status_code") != 200:
+                raise RuntimeError(
+                    f"Batch request {record.get('custom_id')} failed: "
+                    f"{record.get('error') or response.get('body')}"
+                )
+            contents[record["custom_id"]] = response["body"]["choices"][0]["message"]["content"]
+        
+        missing = set(keys) - contents.keys()
+        if missing:
+            raise RuntimeError(f"Batch {batch.id} returned no result for {len(missing)} requests")
+        
+        return [
+            self._decode(contents[key], response_format)
+            for key, (_, _, response_format) in zip(keys, requests)
+        ]
 
     async def process_chunks_two_step(
         self,
@@ -117,124 +553,134 @@ class AsyncLLMClient:
         """
         Two-step processing: first divide into groups, then format.
         Includes post-processing to enforce word limits.
+        Each chunk is pipelined independently, so its post-processing and
+        step 2 start as soon as its own step 1 finishes.
         """
-        logger.info(f"Starting TWO-STEP processing for {len(chunks)} chunks")
+        logger.info("Starting TWO-STEP processing for %d chunks", len(chunks))
         
         # Initialize post-processor with config setting
-        post_processor = GroupPostProcessor(max_words_per_group=config.max_words_per_group)
-        
-        # Step 1: Divide all chunks into groups concurrently
-        logger.info("Step 1: Dividing chunks into groups...")
-        group_divisions = await self._step1_divide_groups(chunks, config)
-        
-        # NEW: Post-process divisions to enforce word limits
-        logger.info(f"Post-processing: Enforcing max {config.max_words_per_group} words per group...")
-        processed_divisions = post_processor.process_divisions(group_divisions)
-        
-        # Log changes
-        for i, (original, processed) in enumerate(zip(group_divisions, processed_divisions)):
-            orig_count = len(original.groups)
-            new_count = len(processed.groups)
-            if orig_count != new_count:
-                logger.info(
-                    f"[Chunk {i}] Post-processing split {orig_count} groups "
-                    f"into {new_count} groups"
-                )
+        post_processor = _get_group_post_processor(config.max_words_per_group)
+        logger.info("Post-processing: Enforcing max %d words per group...", config.max_words_per_group)
         
-        # Step 2: Format all groups into final subtitle structure concurrently
-        logger.info("Step 2: Formatting groups into subtitles...")
-        formatted_timelines = await self._step2_format_groups(chunks, processed_divisions, config)
+        # First failure cancels the remaining chunk pipelines
+        try:
+            async with asyncio.TaskGroup() as tg:
+                tasks = [
+                    tg.create_task(
+                        self._process_chunk_two_step(chunk, config, post_processor),
+                        name=f"chunk-{chunk.chunk_index}-two-step"
+                    )
+                    for chunk in chunks
+                ]
+        except* Exception as eg:
+            for exc in eg.exceptions:
+                logger.error("Two-step processing failed: %s", exc)
+            raise
         
         # Combine results
-        results = []
-        for i, chunk in enumerate(chunks):
-            results.append((i, chunk, formatted_timelines[i]))
-        
-        return results
+        return [(i, chunk, task.result()) for i, (chunk, task) in enumerate(zip(chunks, tasks))]
     
-    async def _step1_divide_groups(
-        self, 
-        chunks: List[Any], 
-        config: Any
-    ) -> List[GroupDivision]:
-        """Step 1: Divide each chunk into verbatim groups."""
-        tasks = []
-        
-        for chunk in chunks:
-            user_prompt = f"""## VIDEO TRANSCRIPT SEGMENT (Chunk {chunk.chunk_index})
-{chunk.text}
-
-Divide this transcript into consecutive verbatim groups following the rules provided."""
-            
-            task = asyncio.create_task(
-                self.generate(
-                    system_prompt=config.group_division_prompt,
-                    user_prompt=user_prompt,
-                    response_format=config.group_division_format,
-                    chunk_id=f"{chunk.chunk_index}-step1"
-                ),
-                name=f"chunk-{chunk.chunk_index}-step1"
+    async def iter_chunks_two_step(
+        self,
+        chunks: List[Any],
+        config: Any,
+    ) -> AsyncIterator[Tuple[int, Any, SubtitleTimeline]]:
+        """
+        Streaming variant of process_chunks_two_step.
+        Yields (chunk_idx, chunk, timeline) in completion order, so callers can
+        start downstream work while slower chunks are still on the network.
+        """
+        logger.info("Starting streaming TWO-STEP processing for %d chunks", len(chunks))
+        post_processor = _get_group_post_processor(config.max_words_per_group)
+        
+        tasks = {
+            asyncio.create_task(
+                self._process_chunk_two_step(chunk, config, post_processor),
+                name=f"chunk-{chunk.chunk_index}-two-step"
+            ): (i, chunk)
+            for i, chunk in enumerate(chunks)
+        }
+        pending = set(tasks)
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    i, chunk = tasks[task]
+                    yield i, chunk, task.result()
+        except Exception as e:
+            logger.error("Two-step processing failed: %s", e)
+            raise
+        finally:
+            # First failure (or an abandoned iterator) cancels the remaining chunk pipelines
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+    
+    async def _process_chunk_two_step(
+        self,
+        chunk: Any,
+        config: Any,
+        post_processor: GroupPostProcessor
+    ) -> SubtitleTimeline:
+        """Run step 1, post-processing and step 2 for a single chunk."""
+        if getattr(config, 'rule_based_division', False):
+            # Mechanical punctuation-aware split: no tokens, no round-trip
+            division = GroupDivision(groups=divide_groups(chunk.text, config.max_words_per_group))
+        else:
+            division = await self._step1_divide_chunk(chunk, config)
+        
+        # Post-process division to enforce word limits (CPU work overlaps other chunks' I/O)
+        processed = post_processor.process(division)
+        orig_count = len(division.groups)
+        new_count = len(processed.groups)
+        if orig_count != new_count:
+            logger.info(
+                "[Chunk %d] Post-processing split %d groups into %d groups",
+                chunk.chunk_index, orig_count, new_count
             )
-            tasks.append(task)
-        
-        # Wait for all group divisions to complete
-        divisions = await asyncio.gather(*tasks, return_exceptions=True)
         
-        # Handle errors
-        results = []
-        for i, result in enumerate(divisions):
-            if isinstance(result, Exception):
-                logger.error(f"[Chunk {i}] Step 1 failed: {result}")
-                raise result
-            results.append(result)
+        return await self._step2_format_chunk(chunk, processed, config)
+    
+    async def _step1_divide_chunk(self, chunk: Any, config: Any) -> GroupDivision:
+        """Step 1: Divide a chunk into verbatim groups."""
+        user_prompt = STEP1_USER_TMPL.format_map(
+            {"chunk_index": chunk.chunk_index, "text": chunk.text}
+        )
         
-        return results
+        return await self._generate_routed(
+            chunk.text,
+            config,
+            system_prompt=config.group_division_prompt,
+            user_prompt=user_prompt,
+            response_format=config.group_division_format,
+            chunk_id=f"{chunk.chunk_index}-step1"
+        )
     
-    async def _step2_format_groups(
+    async def _step2_format_chunk(
         self,
-        chunks: List[Any],
-        group_divisions: List[GroupDivision],
+        chunk: Any,
+        division: GroupDivision,
         config: Any
-    ) -> List[SubtitleTimeline]:
-        """Step 2: Format pre-divided groups into final subtitle structure."""
-        tasks = []
-        
-        for chunk, division in zip(chunks, group_divisions):
-            # Prepare the groups for the formatting prompt
-            groups_text = "\n".join([
-                f"Group {i+1}: \"{group}\""
-                for i, group in enumerate(division.groups)
-            ])
-            
-            user_prompt = f"""## PRE-DIVIDED GROUPS (Chunk {chunk.chunk_index})
-{groups_text}
-
-Format these groups into the subtitle structure with proper line breaks and font types."""
-            # print(config.system_prompt)
-
-            task = asyncio.create_task(
-                self.generate(
-                    system_prompt=config.system_prompt,
-                    user_prompt=user_prompt,
-                    response_format=config.response_format,
-                    chunk_id=f"{chunk.chunk_index}-step2"
-                ),
-                name=f"chunk-{chunk.chunk_index}-step2"
-            )
-            tasks.append(task)
-        
-        # Wait for all formatting to complete
-        timelines = await asyncio.gather(*tasks, return_exceptions=True)
-        
-        # Handle errors
-        results = []
-        for i, result in enumerate(timelines):
-            if isinstance(result, Exception):
-                logger.error(f"[Chunk {i}] Step 2 failed: {result}")
-                raise result
-            results.append(result)
+    ) -> SubtitleTimeline:
+        """Step 2: Format a chunk's pre-divided groups into final subtitle structure."""
+        # Prepare the groups for the formatting prompt
+        groups_text = "\n".join([
+            f"Group {i+1}: {orjson.dumps(group).decode()}"
+            for i, group in enumerate(division.groups)
+        ])
+        
+        user_prompt = STEP2_USER_TMPL.format_map(
+            {"chunk_index": chunk.chunk_index, "groups_text": groups_text}
+        )
         
-        return results
+        return await self._generate_routed(
+            chunk.text,
+            config,
+            system_prompt=config.system_prompt,
+            user_prompt=user_prompt,
+            response_format=config.response_format,
+            chunk_id=f"{chunk.chunk_index}-step2"
+        )
     
     # Keep old method for backward compatibility
     async def process_chunks(
@@ -243,54 +689,63 @@ Format these groups into the subtitle structure with proper line breaks and font
         config: Any,
     ) -> List[Any]:
         """Original single-step processing (kept for compatibility)."""
-        logger.info(f"Submitting {len(chunks)} chunks for processing (max {self.semaphore._value} concurrent)")
-        
-        task_to_meta = {}
+        logger.info(
+            "Submitting %d chunks for processing (max %d concurrent)",
+            len(chunks), self.limiter.total_tokens
+        )
         
-        for chunk in chunks:
-            user_prompt = f"""## VIDEO TRANSCRIPT (Segment {chunk.chunk_index})
-{chunk.text}
-
-Analyze this transcript segment and create optimized subtitle groups. 
-Note: This is segment {chunk.chunk_index} of a longer video (starts at {chunk.start:.1f}s)."""
-            
-            task = asyncio.create_task(
-                self.generate(
-                    system_prompt=config.system_prompt,
-                    user_prompt=user_prompt,
-                    response_format=config.response_format,
-                    chunk_id=chunk.chunk_index
-                ),
-                name=f"chunk-{chunk.chunk_index}"
-            )
-            task_to_meta[task] = (chunk.chunk_index, chunk)
+        if getattr(config, 'mode', 'realtime') == 'batch':
+            results = await self.generate_batch([
+                (
+                    config.system_prompt,
+                    SINGLE_STEP_USER_TMPL.format_map(
+                        {"chunk_index": chunk.chunk_index, "text": chunk.text, "start": chunk.start}
+                    ),
+                    config.response_format
+                )
+                for chunk in chunks
+            ])
+            return [(chunk.chunk_index, chunk, result) for chunk, result in zip(chunks, results)]
         
-        pending = set(task_to_meta.keys())
-        results = []
         completed = 0
         
-        while pending:
-            done, pending = await asyncio.wait(
-                pending,
-                return_when=asyncio.FIRST_COMPLETED
-            )
-            
-            for task in done:
-                chunk_idx, chunk = task_to_meta[task]
-                try:
-                    result = task.result()
-                    results.append((chunk_idx, chunk, result))
-                    completed += 1
-                    logger.info(f"Progress: {completed}/{len(chunks)} chunks completed")
-                except Exception as e:
-                    logger.error(f"[Chunk {chunk_idx}] Task failed: {e}")
-                    raise
-        
-        results.sort(key=lambda x: x[0])
-        return results
+        def log_progress(task: asyncio.Task):
+            nonlocal completed
+            if not task.cancelled() and task.exception() is None:
+                completed += 1
+                logger.info("Progress: %d/%d chunks completed", completed, len(chunks))
+        
+        # First failure cancels the remaining chunk tasks
+        try:
+            async with asyncio.TaskGroup() as tg:
+                tasks = []
+                for chunk in chunks:
+                    user_prompt = SINGLE_STEP_USER_TMPL.format_map(
+                        {"chunk_index": chunk.chunk_index, "text": chunk.text, "start": chunk.start}
+                    )
+                    
+                    task = tg.create_task(
+                        self._generate_routed(
+                            chunk.text,
+                            config,
+                            system_prompt=config.system_prompt,
+                            user_prompt=user_prompt,
+                            response_format=config.response_format,
+                            chunk_id=chunk.chunk_index
+                        ),
+                        name=f"chunk-{chunk.chunk_index}"
+                    )
+                    task.add_done_callback(log_progress)
+                    tasks.append(task)
+        except* Exception as eg:
+            for exc in eg.exceptions:
+                logger.error("Single-step task failed: %s", exc)
+            raise
+        
+        return [(chunk.chunk_index, chunk, task.result()) for chunk, task in zip(chunks, tasks)]
     
     async def close(self):
-        """Cleanup resources."""
+        """Cleanup resources. The response cache belongs to the caller and stays open."""
         await self.client.close()
 
 
@@ -302,26 +757,23 @@ Note: This is segment {chunk.chunk_index} of a longer video (starts at {chunk.st
         """
         Hybrid processing: LLM divides into groups+highlights, then rule-based line division.
         """
-        logger.info(f"Starting HYBRID processing for {len(chunks)} chunks")
-        
-        # Initialize processors
-        font_config = getattr(config, 'font_config', None)
-        post_processor = HybridPostProcessor(max_words_per_group=config.max_words_per_group)
-        # line_divider = HybridLineDivider(max_words_per_line=getattr(config, 'max_words_per_line', 3))
-        line_divider = HybridLineDivider(
-            max_words_per_line=getattr(config, 'max_words_per_line', 3),
-            font_config=font_config
+        logger.info("Starting HYBRID processing for %d chunks", len(chunks))
+        
+        # Reuse processors shared across batches with the same settings
+        post_processor, line_divider = _get_hybrid_tools(
+            config.max_words_per_group,
+            getattr(config, 'max_words_per_line', 3),
+            getattr(config, 'font_config', None)  # Frozen dataclass, hashable as-is
         )
         
         # Step 1: Divide all chunks into groups with highlights concurrently
         logger.info("Step 1: Dividing chunks into groups with highlights...")
         divisions_with_highlights = await self._step1_divide_groups_hybrid(chunks, config)
 
-        print(' #########  ######### division  #########  #########  #########  ') 
-        print(divisions_with_highlights) 
-        print(' #########  ######### division #########  #########  #########  ')
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Divisions with highlights: %s", divisions_with_highlights)
         # Post-process: Split oversized groups and assign highlights correctly
-        logger.info(f"Post-processing: Enforcing max {config.max_words_per_group} words per group...")
+        logger.info("Post-processing: Enforcing max %d words per group...", config.max_words_per_group)
         processed_groups_per_chunk = post_processor.process_divisions(divisions_with_highlights)
         
         # Log changes
@@ -330,8 +782,8 @@ Note: This is segment {chunk.chunk_index} of a longer video (starts at {chunk.st
             new_count = len(processed)
             if orig_count != new_count:
                 logger.info(
-                    f"[Chunk {i}] Post-processing split {orig_count} groups "
-                    f"into {new_count} groups"
+                    "[Chunk %d] Post-processing split %d groups into %d groups",
+                    i, orig_count, new_count
                 )
         
         # Step 2: Rule-based line division (no LLM needed)
@@ -341,7 +793,7 @@ Note: This is segment {chunk.chunk_index} of a longer video (starts at {chunk.st
             subtitle_groups = line_divider.divide_groups(chunk_groups)
             timeline = SubtitleTimeline(timeline=subtitle_groups)
             timelines.append(timeline)
-            logger.info(f"[Chunk {chunk_idx}] Divided into {len(subtitle_groups)} subtitle groups")
+            logger.info("[Chunk %d] Divided into %d subtitle groups", chunk_idx, len(subtitle_groups))
         
         # Combine results - match format of other methods
         results = []
@@ -356,40 +808,45 @@ Note: This is segment {chunk.chunk_index} of a longer video (starts at {chunk.st
         config: Any
     ) -> List[Any]:  # List[GroupDivisionWithHighlights]
         """Step 1: Divide each chunk into groups with highlight words."""
-        tasks = []
-        
-        for chunk in chunks:
-            # Format prompt with max_words limit
-            division_prompt = config.group_division_prompt
-            
-            user_prompt = f"""## VIDEO TRANSCRIPT SEGMENT (Chunk {chunk.chunk_index})
-    {chunk.text}
-
-    Divide this transcript into consecutive verbatim groups with highlight words following the rules provided."""
-            
-            task = asyncio.create_task(
-                self.generate(
-                    system_prompt=division_prompt,
-                    user_prompt=user_prompt,
-                    response_format=config.hybrid_division_format,
-                    chunk_id=f"{chunk.chunk_index}-hybrid-step1"
-                ),
-                name=f"chunk-{chunk.chunk_index}-hybrid-step1"
-            )
-            tasks.append(task)
-        
-        # Wait for all group divisions to complete
-        divisions = await asyncio.gather(*tasks, return_exceptions=True)
+        if getattr(config, 'mode', 'realtime') == 'batch':
+            return await self.generate_batch([
+                (
+                    config.group_division_prompt,
+                    HYBRID_STEP1_USER_TMPL.format_map(
+                        {"chunk_index": chunk.chunk_index, "text": chunk.text}
+                    ),
+                    config.hybrid_division_format
+                )
+                for chunk in chunks
+            ])
         
-        # Handle errors
-        results = []
-        for i, result in enumerate(divisions):
-            if isinstance(result, Exception):
-                logger.error(f"[Chunk {i}] Hybrid Step 1 failed: {result}")
-                raise result
-            results.append(result)
+        # First failure cancels the remaining step-1 calls
+        try:
+            async with asyncio.TaskGroup() as tg:
+                tasks = []
+                for chunk in chunks:
+                    user_prompt = HYBRID_STEP1_USER_TMPL.format_map(
+                        {"chunk_index": chunk.chunk_index, "text": chunk.text}
+                    )
+                    
+                    task = tg.create_task(
+                        self._generate_routed(
+                            chunk.text,
+                            config,
+                            system_prompt=config.group_division_prompt,
+                            user_prompt=user_prompt,
+                            response_format=config.hybrid_division_format,
+                            chunk_id=f"{chunk.chunk_index}-hybrid-step1"
+                        ),
+                        name=f"chunk-{chunk.chunk_index}-hybrid-step1"
+                    )
+                    tasks.append(task)
+        except* Exception as eg:
+            for exc in eg.exceptions:
+                logger.error("Hybrid Step 1 failed: %s", exc)
+            raise
         
-        return results
+        return [task.result() for task in tasks]
 
 
 async def get_transcript_async(audio_path: str, retries: int = 3, language: str = "en") -> dict:
@@ -401,7 +858,7 @@ async def get_transcript_async(audio_path: str, retries: int = 3, language: str
     
     for attempt in range(retries):
         try:
-            with open(audio_path, "rb") as f:
+            with open(audio_path, "rb", buffering=IO_BUFFER_SIZE) as f:
                 transcript = await client.audio.transcriptions.create(
                     model="whisper-1",
                     file=f,
@@ -428,7 +885,7 @@ def get_transcript(audio_path: str, retries: int = 3) -> dict:
     
     for attempt in range(retries):
         try:
-            with open(audio_path, "rb") as f:
+            with open(audio_path, "rb", buffering=IO_BUFFER_SIZE) as f:
                 transcript = client.audio.transcriptions.create(
                     model="whisper-1",
                     file=f,
@@ -1,19 +1,14 @@
 
 # --- chunker.py ---
 from typing import List, Union, Dict, Any
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass
 import logging
+import orjson
+from subtitle_generator.models import WordTimestamp
 
 logger = logging.getLogger(__name__)
 
 
-@dataclass
-class WordTimestamp:
-    word: str
-    start: float
-    end: float
-
-
 @dataclass
 class TranscriptChunk:
     """Segment of transcript with absolute timestamps preserved"""
@@ -23,14 +18,9 @@ class TranscriptChunk:
     end: float    # Absolute end time in original audio
     chunk_index: int
     
-    def to_dict(self) -> Dict[str, Any]:
-        return {
-            "text": self.text,
-            "words": [asdict(w) for w in self.words],
-            "start": self.start,
-            "end": self.end,
-            "chunk_index": self.chunk_index
-        }
+    def to_json_bytes(self) -> bytes:
+        """Serialize chunk (including nested words) to JSON bytes."""
+        return orjson.dumps(self)
 
 
 class TranscriptChunker:
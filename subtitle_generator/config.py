@@ -1,14 +1,13 @@
 
 # --- config.py ---
 from dataclasses import dataclass
-from typing import Optional, Type, Any
+from typing import Optional, Tuple, Type, Any, Literal
 from subtitle_generator.models import SubtitleTimeline,GroupDivision, GroupDivisionWithHighlights, FontConfig
 from subtitle_generator.prompts import (
     GRADIENT_BASE_ITALIC, NORMAL_AND_BOLD, THREE_LINES, TWO_LINES, GRADIENT_BASE, HYBRID_GROUP_DIVISION_NO_HIGHLIGHT,
-    THREE_LINES_GROUP_DIVISION, TWO_LINES_GROUP_DIVISION,  COMBO,NORMAL_AND_ITALIC
+    THREE_LINES_GROUP_DIVISION, TWO_LINES_GROUP_DIVISION,  COMBO,NORMAL_AND_ITALIC, HYBRID_GROUP_DIVISION,
+    TWO_LINES_COMBINED
 )
-
-from subtitle_generator.prompts import HYBRID_GROUP_DIVISION
 # @dataclass
 # class GenerationConfig:
 #     """Configuration for subtitle generation strategies."""
@@ -23,11 +22,6 @@ from subtitle_generator.prompts import HYBRID_GROUP_DIVISION
 
 # Add to subtitle_generator/config.py prompts import and GenerationConfig
 
-# Add to the imports at top:
-from subtitle_generator.prompts import (
-    # ... existing imports ...
-    HYBRID_GROUP_DIVISION,  # NEW
-)
 from dataclasses import dataclass, field
 
 # Update GenerationConfig to include hybrid format:
@@ -44,95 +38,129 @@ class GenerationConfig:
     max_words_special: int = 6
     max_words_regular: int = 3
     model: str = "gpt-5.1"
+    # OpenAI-compatible endpoint, e.g. a self-hosted vLLM server
+    # (`vllm serve <model> --enable-prefix-caching` -> "http://vllm:8000/v1"); None = OpenAI
+    base_url: Optional[str] = None
+    # Chunks under small_model_max_words try this cheaper model first; invalid output falls back to `model`
+    small_model: Optional[str] = None
+    small_model_max_words: int = 25
+    # Output cap = 256 + words * output_tokens_per_word; stops runaway generations (None disables).
+    # Off by default: on reasoning models (gpt-5.x, o-series) the cap also counts hidden reasoning tokens
+    output_tokens_per_word: Optional[int] = None
+    # Append (prompt, response) pairs as OpenAI fine-tuning JSONL, e.g. to train a small_model replacement
+    training_data_path: Optional[str] = None
+    # Stable id of the video being rendered; with the response cache enabled, a re-render
+    # sends each chunk's previous output as an OpenAI predicted output
+    render_key: Optional[str] = None
+    # Model-name prefixes that accept predicted outputs; other models never get a prediction,
+    # so render_key only stores outputs (no speed-up) for the default gpt-5.1 styles
+    prediction_models: Tuple[str, ...] = ("gpt-4o", "gpt-4.1")
     max_concurrent: int = 30
     max_chunk: int = 59
     max_words_per_group: int = 8
     use_hybrid: bool = True
+    use_two_step: bool = True  # False: one call returns groups and lines together
+    rule_based_division: bool = False  # Two-step only: divide groups in Python, skip the step-1 LLM call
+    # "batch": route LLM calls through the OpenAI Batch API (~50% cheaper, up to 24h latency)
+    mode: Literal["realtime", "batch"] = "realtime"
     # NEW: Line division strategy
     max_words_per_line: int = 3  # NEW: For rule-based line division
     font_config: FontConfig = field(default_factory=FontConfig)
+    # Response cache: replays of identical LLM calls skip the API
+    enable_cache: bool = False
+    cache_url: Optional[str] = None  # redis://... or sqlite:///path.db; falls back to REDIS_URL env var
+    cache_ttl: int = 7 * 86400
     
 
+# Built once at import; style configs are shared, read-only instances
+_CONFIGS = {
+    "FaB": GenerationConfig(
+        name="Fade and Blur",
+        # system_prompt=FADE_AND_BLUR,
+        group_division_prompt=HYBRID_GROUP_DIVISION_NO_HIGHLIGHT,  # NEW,
+        hybrid_division_format=GroupDivisionWithHighlights,
+        max_words_per_group=9,
+        font_config=FontConfig(bold=False, normal=True, italic=False) # when bold is false, it will use divide_no_highlight line divider
+    ),
+    "Combo": GenerationConfig(
+        name="Combo",
+        group_division_prompt=HYBRID_GROUP_DIVISION, 
+        hybrid_division_format=GroupDivisionWithHighlights,
+        max_words_per_group=8,
+        font_config=FontConfig(bold=True, normal=True, italic=True)
+    ),
+    "NaI": GenerationConfig(
+        name="Normal and Italic",
+        group_division_prompt=HYBRID_GROUP_DIVISION,  # NEW
+        hybrid_division_format=GroupDivisionWithHighlights,
+        max_words_per_group=8,
+        font_config=FontConfig(bold=False, normal=True, italic=True)
+    ),
+    "NaB": GenerationConfig(
+        name="Normal and Bold",
+        group_division_prompt=HYBRID_GROUP_DIVISION,  # NEW
+        hybrid_division_format=GroupDivisionWithHighlights,
+        max_words_per_group=8,
+        font_config=FontConfig(bold=True, normal=True, italic=False)
+    ),
+    "EW": GenerationConfig(
+        name="Equal Width",
+        group_division_prompt=HYBRID_GROUP_DIVISION,  # NEW
+        hybrid_division_format=GroupDivisionWithHighlights,
+        max_words_per_group=8,
+        font_config=FontConfig(bold=True, normal=True, italic=True)
+    ),
+    "GB": GenerationConfig(
+        name="Gradient Base",
+        group_division_prompt=HYBRID_GROUP_DIVISION,  # NEW
+        hybrid_division_format=GroupDivisionWithHighlights,
+        max_words_per_group=8,
+        font_config=FontConfig(bold=True, normal=True, italic=False)
+    ),
+    "Glow": GenerationConfig(
+        name="Glow",
+        # system_prompt=NORMAL_AND_BOLD,
+        # group_division_prompt=THREE_LINES_GROUP_DIVISION,  # NEW,
+        group_division_prompt=HYBRID_GROUP_DIVISION,  # NEW
+        hybrid_division_format=GroupDivisionWithHighlights,
+        max_words_special=7,
+        max_words_regular=3,
+        max_words_per_group=8,
+        font_config=FontConfig(bold=True, normal=True, italic=False)
+    ),
+    "GlowI": GenerationConfig(
+        name="Glow Italic",
+        group_division_prompt=HYBRID_GROUP_DIVISION,  # NEW
+        hybrid_division_format=GroupDivisionWithHighlights,
+        max_words_per_group=8,
+        font_config=FontConfig(bold=False, normal=True, italic=True)
+    ),
+    "GBI": GenerationConfig(
+        name="Gradient Base Italic",
+        group_division_prompt=HYBRID_GROUP_DIVISION,  # NEW
+        hybrid_division_format=GroupDivisionWithHighlights,
+        max_words_per_group=8,
+        font_config=FontConfig(bold=False, normal=True, italic=True)
+    ),
+    "TL": GenerationConfig(
+        name="Two Lines",
+        system_prompt=TWO_LINES_COMBINED,  # Grouping + layout in a single request per chunk
+        response_format=SubtitleTimeline,
+        use_hybrid=False,
+        use_two_step=False
+    ),
+
+
+}
+
+
 class PromptRegistry:
     """Central registry for different subtitle formatting strategies."""
 
     @classmethod
     def get_config(cls, style: str) -> GenerationConfig:
         """Get configuration by style name."""
-        configs = {
-             "FaB": GenerationConfig(
-                name="Fade and Blur",
-                # system_prompt=FADE_AND_BLUR,
-                group_division_prompt=HYBRID_GROUP_DIVISION_NO_HIGHLIGHT,  # NEW,
-                hybrid_division_format=GroupDivisionWithHighlights,
-                max_words_per_group=9,
-                font_config=FontConfig(bold=False, normal=True, italic=False) # when bold is false, it will use divide_no_highlight line divider
-            ),
-             "Combo": GenerationConfig(
-                name="Combo",
-                group_division_prompt=HYBRID_GROUP_DIVISION, 
-                hybrid_division_format=GroupDivisionWithHighlights,
-                max_words_per_group=8,
-                font_config=FontConfig(bold=True, normal=True, italic=True)
-            ),
-             "NaI": GenerationConfig(
-                name="Normal and Italic",
-                group_division_prompt=HYBRID_GROUP_DIVISION,  # NEW
-                hybrid_division_format=GroupDivisionWithHighlights,
-                max_words_per_group=8,
-                font_config=FontConfig(bold=False, normal=True, italic=True)
-            ),
-             "NaB": GenerationConfig(
-                name="Normal and Bold",
-                group_division_prompt=HYBRID_GROUP_DIVISION,  # NEW
-                hybrid_division_format=GroupDivisionWithHighlights,
-                max_words_per_group=8,
-                font_config=FontConfig(bold=True, normal=True, italic=False)
-            ),
-             "EW": GenerationConfig(
-                name="Equal Width",
-                group_division_prompt=HYBRID_GROUP_DIVISION,  # NEW
-                hybrid_division_format=GroupDivisionWithHighlights,
-                max_words_per_group=8,
-                font_config=FontConfig(bold=True, normal=True, italic=True)
-            ),
-             "GB": GenerationConfig(
-                name="Gradient Base",
-                group_division_prompt=HYBRID_GROUP_DIVISION,  # NEW
-                hybrid_division_format=GroupDivisionWithHighlights,
-                max_words_per_group=8,
-                font_config=FontConfig(bold=True, normal=True, italic=False)
-            ),
-             "Glow": GenerationConfig(
-                name="Glow",
-                # system_prompt=NORMAL_AND_BOLD,
-                # group_division_prompt=THREE_LINES_GROUP_DIVISION,  # NEW,
-                group_division_prompt=HYBRID_GROUP_DIVISION,  # NEW
-                hybrid_division_format=GroupDivisionWithHighlights,
-                max_words_special=7,
-                max_words_regular=3,
-                max_words_per_group=8,
-                font_config=FontConfig(bold=True, normal=True, italic=False)
-            ),
-             "GlowI": GenerationConfig(
-                name="Glow Italic",
-                group_division_prompt=HYBRID_GROUP_DIVISION,  # NEW
-                hybrid_division_format=GroupDivisionWithHighlights,
-                max_words_per_group=8,
-                font_config=FontConfig(bold=False, normal=True, italic=True)
-            ),
-             "GBI": GenerationConfig(
-                name="Gradient Base Italic",
-                group_division_prompt=HYBRID_GROUP_DIVISION,  # NEW
-                hybrid_division_format=GroupDivisionWithHighlights,
-                max_words_per_group=8,
-                font_config=FontConfig(bold=False, normal=True, italic=True)
-            ),
-
-
-        }
-        if style not in configs:
-            raise ValueError(f"Unknown style: {style}. Choose from {list(configs.keys())}")
-        return configs[style]
-
-
+        try:
+            return _CONFIGS[style]
+        except KeyError:
+            raise ValueError(f"Unknown style: {style}. Choose from {list(_CONFIGS.keys())}") from None
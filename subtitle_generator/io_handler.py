@@ -3,54 +3,102 @@
 import pickle
 import json
 import logging
+import orjson
+import msgpack
 from pathlib import Path
 from typing import Any, List
 from subtitle_generator.models import WordTimestamp
 
 logger = logging.getLogger(__name__)
 
-# Pickle load (deserialize) from a file
+# 1 MB buffers keep large transcript reads/writes from being syscall-bound
+IO_BUFFER_SIZE = 1 << 20
 
-class IOHandler:
-    """Handle all file I/O operations."""
-    
-    @staticmethod
-    def load_pickle(pickle_path: str) -> Any:
-        """Load word timestamps from pickle file."""
-        path = Path(pickle_path)
-        if not path.exists():
-            raise FileNotFoundError(f"Pickle file not found: {pickle_path}")
-            
-        with open(path, 'rb') as f:
-            data = pickle.load(f)
-        logger.info(f"Loaded pickle from {pickle_path}")
-        return data
-    
-    @staticmethod
-    def extract_word_timestamps(data: Any) -> List[WordTimestamp]:
-        """
-        Extract word timestamps from various possible formats.
-        Handles both list[WordTimestamp] and objects with .words attribute.
-        """
-        if isinstance(data, list):
-            return [WordTimestamp(**w) if isinstance(w, dict) else w for w in data]
-        
-        if hasattr(data, 'words'):
-            words = data.words
-            return [WordTimestamp(**w) if isinstance(w, dict) else w for w in words]
-        
-        if hasattr(data, 'text'):
-            # It's likely a transcription object, return empty list or parse from text
-            raise ValueError("Transcription object requires word-level timestamps. Ensure input has word timestamps.")
-        
-        raise ValueError(f"Unknown data format: {type(data)}")
-    
-    @staticmethod
-    def save_json(data: Any, output_path: str, indent: int = 2):
-        """Save data to JSON file."""
-        path = Path(output_path)
-        path.parent.mkdir(parents=True, exist_ok=True)
-        
-        with open(path, 'w', encoding='utf-8') as f:
+
+def load_pickle(pickle_path: str) -> Any:
+    """Load word timestamps from pickle file."""
+    path = Path(pickle_path)
+    if not path.exists():
+        raise FileNotFoundError(f"Pickle file not found: {pickle_path}")
+
+    with open(path, 'rb', buffering=IO_BUFFER_SIZE) as f:
+        data = pickle.load(f)
+    logger.info(f"Loaded pickle from {pickle_path}")
+    return data
+
+
+def load_transcript(transcript_path: str) -> Any:
+    """
+    Load word timestamps, choosing the decoder by file suffix.
+    Supports .msgpack, .json and .pkl/.pickle; prefer the first two for untrusted input.
+    """
+    path = Path(transcript_path)
+    if not path.exists():
+        raise FileNotFoundError(f"Transcript file not found: {transcript_path}")
+
+    suffix = path.suffix.lower()
+    if suffix == '.msgpack':
+        data = msgpack.unpackb(path.read_bytes(), raw=False)
+    elif suffix == '.json':
+        data = orjson.loads(path.read_bytes())
+    elif suffix in ('.pkl', '.pickle'):
+        return load_pickle(transcript_path)
+    else:
+        raise ValueError(f"Unsupported transcript format: {suffix}")
+    logger.info(f"Loaded transcript from {transcript_path}")
+    return data
+
+
+def _to_word_timestamps(words: List[Any]) -> List[WordTimestamp]:
+    """Convert dict items to WordTimestamp; already-typed lists are returned as-is."""
+    if not words or isinstance(words[0], WordTimestamp):
+        return words
+    # Positional args are cheaper than **w splatting
+    return [
+        WordTimestamp(w['word'], w['start'], w['end']) if isinstance(w, dict) else w
+        for w in words
+    ]
+
+
+def extract_word_timestamps(data: Any) -> List[WordTimestamp]:
+    """
+    Extract word timestamps from various possible formats.
+    Handles both list[WordTimestamp] and objects with .words attribute.
+    """
+    if isinstance(data, list):
+        return _to_word_timestamps(data)
+
+    if hasattr(data, 'words'):
+        return _to_word_timestamps(data.words)
+
+    if hasattr(data, 'text'):
+        # It's likely a transcription object, return empty list or parse from text
+        raise ValueError("Transcription object requires word-level timestamps. Ensure input has word timestamps.")
+
+    raise ValueError(f"Unknown data format: {type(data)}")
+
+
+def save_json(data: Any, output_path: str, indent: int = 2):
+    """Save data to JSON file."""
+    path = Path(output_path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    if indent in (None, 2):
+        # orjson emits UTF-8 bytes directly; one write for the whole buffer
+        option = orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        path.write_bytes(orjson.dumps(data, option=option))
+    else:
+        # orjson only supports 2-space indentation
+        with open(path, 'w', encoding='utf-8', buffering=IO_BUFFER_SIZE) as f:
             json.dump(data, f, indent=indent, ensure_ascii=False)
-        logger.info(f"Saved output to {output_path}")
+    logger.info(f"Saved output to {output_path}")
+
+
+class IOHandler:
+    """Backward-compatible namespace over the module-level I/O functions."""
+    load_pickle = staticmethod(load_pickle)
+    load_transcript = staticmethod(load_transcript)
+    extract_word_timestamps = staticmethod(extract_word_timestamps)
+    save_json = staticmethod(save_json)
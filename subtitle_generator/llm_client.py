@@ -1,20 +1,45 @@
 
 # --- llm_client.py ---
+import asyncio
 import time
 import logging
 from typing import Optional, Type, Any, List
-from openai import OpenAI
-from models import WordTimestamp
+from openai import AsyncOpenAI, OpenAI
+from subtitle_generator.models import WordTimestamp
+from subtitle_generator.async_llm_client import RETRYABLE_ERRORS, json_schema_format
+from subtitle_generator.io_handler import IO_BUFFER_SIZE
+
+logger = logging.getLogger(__name__)
 
 
 class LLMClient:
     """Wrapper for OpenAI API with retry logic and structured output."""
     
+    # Same transient-only policy as AsyncLLMClient: 4xx request errors fail fast,
+    # cancellation and interrupts propagate immediately
+    RETRYABLE_ERRORS = RETRYABLE_ERRORS
+    
     def __init__(self, api_key: str, model: str = "gpt-4o"):
         self.client = OpenAI(api_key=api_key)
+        self.async_client = AsyncOpenAI(api_key=api_key)
         self.model = model
     
-    def generate(
+    def _request_kwargs(self, messages: List[dict], response_format: Optional[Type[Any]]) -> dict:
+        """Build chat.completions.create arguments."""
+        kwargs = {"model": self.model, "messages": messages}
+        if response_format:
+            kwargs["response_format"] = json_schema_format(response_format)
+        return kwargs
+    
+    @staticmethod
+    def _decode(completion: Any, response_format: Optional[Type[Any]]) -> Any:
+        """Decode the raw content directly (orjson for FastModel formats)."""
+        content = completion.choices[0].message.content
+        if response_format:
+            return response_format.model_validate_json(content)
+        return content
+    
+    async def generate(
         self,
         system_prompt: str,
         user_prompt: str,
@@ -24,40 +49,60 @@ class LLMClient:
     ) -> Any:
         """
         Generate completion with automatic retry and structured output support.
+        Backs off with asyncio.sleep so a retry never blocks the event loop.
         """
         messages = [
             {"role": "system", "content": system_prompt},
             {"role": "user", "content": user_prompt}
         ]
         
-        last_exception = None
+        if max_retries < 1:
+            raise ValueError(f"max_retries must be at least 1, got {max_retries}")
         
         for attempt in range(max_retries):
             try:
-                if response_format:
-                    completion = self.client.chat.completions.parse(
-                        model=self.model,
-                        messages=messages,
-                        response_format=response_format,
-                    )
-                    return completion.choices[0].message.parsed
-                else:
-                    completion = self.client.chat.completions.create(
-                        model=self.model,
-                        messages=messages
-                    )
-                    return completion.choices[0].message.content
-                    
-            except Exception as e:
-                last_exception = e
+                completion = await self.async_client.chat.completions.create(
+                    **self._request_kwargs(messages, response_format)
+                )
+                return self._decode(completion, response_format)
+            except self.RETRYABLE_ERRORS as e:
+                if attempt == max_retries - 1:
+                    logger.error(f"All {max_retries} retry attempts failed")
+                    raise
                 logger.warning(f"Attempt {attempt + 1} failed: {e}")
-                if attempt < max_retries - 1:
-                    sleep_time = retry_delay * (2 ** attempt)  # Exponential backoff
-                    time.sleep(sleep_time)
-                continue
+                await asyncio.sleep(retry_delay * (2 ** attempt))  # Exponential backoff
+    
+    def generate_sync(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        response_format: Optional[Type[Any]] = None,
+        max_retries: int = 3,
+        retry_delay: float = 1.0
+    ) -> Any:
+        """
+        Blocking variant of generate; only call it from worker threads, never the event loop.
+        """
+        messages = [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": user_prompt}
+        ]
+        
+        if max_retries < 1:
+            raise ValueError(f"max_retries must be at least 1, got {max_retries}")
         
-        logger.error(f"All {max_retries} retry attempts failed")
-        raise last_exception
+        for attempt in range(max_retries):
+            try:
+                completion = self.client.chat.completions.create(
+                    **self._request_kwargs(messages, response_format)
+                )
+                return self._decode(completion, response_format)
+            except self.RETRYABLE_ERRORS as e:
+                if attempt == max_retries - 1:
+                    logger.error(f"All {max_retries} retry attempts failed")
+                    raise
+                logger.warning(f"Attempt {attempt + 1} failed: {e}")
+                time.sleep(retry_delay * (2 ** attempt))  # Exponential backoff
 
 
 
@@ -67,7 +112,7 @@ def get_transcript(audio_path: str, retries: int = 3) -> List[WordTimestamp]:
     """Get word timestamps with retry logic."""
     for attempt in range(retries):
         try:
-            with open(audio_path, "rb") as f:
+            with open(audio_path, "rb", buffering=IO_BUFFER_SIZE) as f:
                 transcript = client.audio.transcriptions.create(
                     model="whisper-1", file=f,
                     response_format="verbose_json",
@@ -2,6 +2,7 @@
 # --- merger.py ---
 from typing import List, Dict, Any
 import logging
+import operator
 
 logger = logging.getLogger(__name__)
 
@@ -15,23 +16,25 @@ class TimelineMerger:
         Combine multiple chunk results into single timeline.
         Reassigns IDs sequentially across chunks.
         """
-        all_groups = []
-        
-        for chunk_groups in processed_chunks:
-            all_groups.extend(chunk_groups)
-        
-        # Reassign sequential IDs
+        # Single pass: assign sequential IDs while appending
         final_timeline = []
-        for g_idx, group in enumerate(all_groups):
-            group['id'] = f"group-{g_idx}"
-            
-            for l_idx, line in enumerate(group.get('lines', [])):
-                line['id'] = f"group-{g_idx}-line-{l_idx}"
+        g_idx = 0
+        for chunk_groups in processed_chunks:
+            for group in chunk_groups:
+                # Build each id prefix once and extend it by concatenation
+                gp = "group-" + str(g_idx)
+                group['id'] = gp
+                
+                for l_idx, line in enumerate(group.get('lines', ())):
+                    lp = gp + "-line-" + str(l_idx)
+                    line['id'] = lp
+                    
+                    wp = lp + "-word-"
+                    for w_idx, word in enumerate(line.get('words', ())):
+                        word['id'] = wp + str(w_idx)
                 
-                for w_idx, word in enumerate(line.get('words', [])):
-                    word['id'] = f"group-{g_idx}-line-{l_idx}-word-{w_idx}"
-            
-            final_timeline.append(group)
+                final_timeline.append(group)
+                g_idx += 1
         
         logger.info(f"Merged {len(processed_chunks)} chunks into {len(final_timeline)} total groups")
         return final_timeline
@@ -42,13 +45,14 @@ class TimelineMerger:
         if not timeline:
             return True
         
-        # Check chronological order
-        prev_end = 0
-        for group in timeline:
-            start = group.get('start', 0)
-            if start < prev_end - 0.1:  # 0.1s tolerance for floating point
-                logger.warning(f"Timeline overlap detected: group at {start} starts before previous ended at {prev_end}")
-                return False
-            prev_end = group.get('end', start)
+        # Check chronological order with C-level comparisons over flat start/end lists
+        # (the 0.1s floating-point tolerance is folded into the end bounds)
+        starts = [g.get('start', 0) for g in timeline]
+        bounds = [-0.1] + [g.get('end', start) - 0.1 for g, start in zip(timeline, starts)]
+        if any(map(operator.lt, starts, bounds)):
+            i = next(i for i, (s, b) in enumerate(zip(starts, bounds)) if s < b)
+            prev_end = bounds[i] + 0.1
+            logger.warning(f"Timeline overlap detected: group at {starts[i]} starts before previous ended at {prev_end}")
+            return False
         
-        return True
\ No newline at end of file
+        return True
@@ -1,9 +1,40 @@
 
 # --- models.py ---
-from pydantic import BaseModel, Field
-from typing import List, Literal, Optional
-from dataclasses import dataclass
+from pydantic import BaseModel, ConfigDict, Field, PrivateAttr
+from typing import Any, Dict, List, Literal, Optional, Tuple, Union
+from dataclasses import dataclass, field
 import random
+import orjson
+
+__all__ = [
+    "FastModel",
+    "SubtitleLine",
+    "SubtitleGroup",
+    "SubtitleTimeline",
+    "WordTimestamp",
+    "WordOut",
+    "ProcessedLine",
+    "ProcessedGroup",
+    "GroupDivision",
+    "GroupWithHighlight",
+    "GroupDivisionWithHighlights",
+    "FontConfig",
+]
+
+
+class FastModel(BaseModel):
+    """BaseModel whose JSON decoding goes through orjson instead of stdlib json."""
+    model_config = ConfigDict(populate_by_name=True)
+
+    @classmethod
+    def model_validate_json(
+        cls,
+        json_data: Union[str, bytes, bytearray],
+        *,
+        strict: Optional[bool] = None,
+        context: Optional[Dict[str, Any]] = None
+    ):
+        return cls.model_validate(orjson.loads(json_data), strict=strict, context=context)
 
 
 class SubtitleLine(BaseModel):
@@ -28,23 +59,32 @@ class SubtitleGroup(BaseModel):
     end: Optional[float] = None
 
 
-class SubtitleTimeline(BaseModel):
+class SubtitleTimeline(FastModel):
     timeline: List[SubtitleGroup] = Field(
         description="Ordered list of groups covering entire transcript"
     )
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class WordTimestamp:
     word: str
     start: float
     end: float
 
 
+@dataclass(slots=True)
+class WordOut:
+    """Matched word with timestamps; slotted, so far lighter than a per-word dict."""
+    word: str
+    start: float
+    end: float
+    id: Optional[str] = None
+
+
 class ProcessedLine(SubtitleLine):
     start: float = 0.0
     end: float = 0.0
-    words: List[dict] = Field(default_factory=list)
+    words: List[WordOut] = Field(default_factory=list)
     id: Optional[str] = None
 
 
@@ -54,7 +94,7 @@ class ProcessedGroup(SubtitleGroup):
 
 
 # NEW: Model for group division step
-class GroupDivision(BaseModel):
+class GroupDivision(FastModel):
     """First step: Divide transcript into verbatim groups"""
     groups: List[str] = Field(
         description="List of verbatim text groups from the transcript. Each group must contain exact consecutive words from the transcript."
@@ -69,8 +109,10 @@ class GroupWithHighlight(BaseModel):
         default=None,
         description="The emphasis/highlight word for this group (must exist in group_text)"
     )
+    # group_text.split(), stashed by HybridPostProcessor so the line divider needn't re-split
+    _words: Optional[List[str]] = PrivateAttr(default=None)
 
-class GroupDivisionWithHighlights(BaseModel):
+class GroupDivisionWithHighlights(FastModel):
     """First step of hybrid: Divide transcript into groups with highlight words."""
     groups: List[GroupWithHighlight] = Field(
         description="List of groups with their highlight words from the transcript."
@@ -79,7 +121,8 @@ class GroupDivisionWithHighlights(BaseModel):
 
 
 
-class FontConfig(BaseModel):
+@dataclass(slots=True, frozen=True)
+class FontConfig:
     """
     Font configuration for a subtitle style.
     
@@ -91,6 +134,7 @@ class FontConfig(BaseModel):
     bold: bool = False      # If True, use bold for highlight
     italic: bool = False    # If True and bold=False, use italic for highlight
     normal: bool = True     # Always True for supporting lines (except randomization in Combo)
+    _supporting_fonts: Tuple[str, ...] = field(default=("normal",), init=False, repr=False, compare=False)
     
     def get_highlight_font(self) -> Literal["bold", "italic", "normal"]:
         """Determine which font to use for highlight word."""
@@ -101,13 +145,8 @@ class FontConfig(BaseModel):
         else:
             return "normal"
     
-    def get_supporting_fonts(self) -> List[Literal["normal", "italic"]]:
-        """
-        Get list of available supporting fonts for alternating use.
-        
-        - Default: ["normal"]
-        - Combo style (bold=True, italic=True): ["normal", "italic"] for alternating
-        """
+    def __post_init__(self) -> None:
+        """Resolve the supporting-font rotation once per config."""
         fonts = []
         
         # Always include normal if available
@@ -115,14 +154,20 @@ class FontConfig(BaseModel):
             fonts.append("normal")
         
         # In Combo mode, also include italic for variety
-        if self.bold and self.italic and self.italic:
+        if self.bold and self.italic:
             fonts.append("italic")
         
         # Fallback to normal if nothing selected
-        if not fonts:
-            fonts = ["normal"]
-            
-        return fonts
+        object.__setattr__(self, "_supporting_fonts", tuple(fonts) or ("normal",))
+    
+    def get_supporting_fonts(self) -> List[Literal["normal", "italic"]]:
+        """
+        Get list of available supporting fonts for alternating use.
+        
+        - Default: ["normal"]
+        - Combo style (bold=True, italic=True): ["normal", "italic"] for alternating
+        """
+        return list(self._supporting_fonts)
     
     def get_supporting_font(self) -> Literal["normal", "italic"]:
         """
@@ -131,8 +176,8 @@ class FontConfig(BaseModel):
         - Default: always "normal"
         - Combo style (bold=True, italic=True): randomly choose "normal" or "italic"
         """
-        fonts = self.get_supporting_fonts()
-        return random.choice(fonts) if len(fonts) > 1 else fonts[0]
+        fonts = self._supporting_fonts
+        return fonts[0] if len(fonts) == 1 else random.choice(fonts)
 
     def should_use_highlight(self) -> bool:
         """
@@ -1,16 +1,45 @@
 # pipeline.py (Updated for hybrid processing)
 import asyncio
+import copy
 import logging
-from typing import List, Optional
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, AsyncIterator, List, Optional, Tuple
+from pydantic import TypeAdapter
 from .merger import TimelineMerger
 from .chunker import TranscriptChunker
 from .async_llm_client import AsyncLLMClient
 from .timestamp_matcher import TimestampMatcher
-from .io_handler import IOHandler
 from .config import GenerationConfig
+from .models import ProcessedGroup, SubtitleGroup, WordTimestamp
+
+try:
+    import uvloop  # libuv-based event loop; not available on Windows
+except ImportError:
+    uvloop = None
 
 logger = logging.getLogger(__name__)
 
+# Whole-list adapters: one compiled pydantic-core serializer call per chunk
+_GROUPS_ADAPTER = TypeAdapter(List[SubtitleGroup])
+_PROCESSED_ADAPTER = TypeAdapter(List[ProcessedGroup])
+
+
+def _match_chunk(
+    matcher: TimestampMatcher,
+    groups: List[dict],
+    word_ts: List[WordTimestamp]
+) -> List[dict]:
+    """Timestamp-match one chunk's groups; module-level so process pools can pickle it."""
+    processed = matcher.process_groups(groups, word_ts)
+    return _PROCESSED_ADAPTER.dump_python(processed)
+
+
+async def _aiter_list(items):
+    """Adapt an already-materialized result list to the streaming interface."""
+    for item in items:
+        yield item
+
 
 class SubtitlePipeline:
     def __init__(
@@ -21,33 +50,92 @@ class SubtitlePipeline:
         max_concurrent: int = 3,
         timeout: float = 60.0,
         matcher: Optional[TimestampMatcher] = None,
-        io_handler: Optional[IOHandler] = None,
+        io_handler: Optional[Any] = None,  # Deprecated and ignored; IO is done via io_handler's functions
         use_two_step: bool = True,
-        use_hybrid: bool = False  # NEW: Enable hybrid mode
+        use_hybrid: bool = False,  # NEW: Enable hybrid mode
+        response_cache: Optional[Any] = None,
+        cpu_workers: Optional[int] = None,  # Process pool size for matching; None = threads
+        base_url: Optional[str] = None  # OpenAI-compatible server (e.g. vLLM); None = OpenAI
     ):
+        if io_handler is not None:
+            warnings.warn(
+                "SubtitlePipeline(io_handler=...) is deprecated and ignored",
+                DeprecationWarning,
+                stacklevel=2
+            )
         self.chunker = TranscriptChunker(max_duration=max_chunk_duration)
-        self.llm_client = AsyncLLMClient(
+        # The LLM client is acquired per run, on the loop that run executes in
+        self._client_kwargs = dict(
             api_key=api_key,
             model=model,
             max_concurrent=max_concurrent,
-            timeout=timeout
+            timeout=timeout,
+            response_cache=response_cache,
+            base_url=base_url
         )
         self.matcher = matcher or TimestampMatcher()
-        self.io = io_handler or IOHandler()
         self.merger = TimelineMerger()
         self.model = model
         self.use_two_step = use_two_step
         self.use_hybrid = use_hybrid  # NEW
+        self.cpu_workers = cpu_workers
     
-    async def process_chunk(self, chunk, timeline):
-        """Process single chunk."""
-        groups = [g.model_dump() for g in timeline.timeline]
+    def _prepare_chunk(self, chunk, timeline):
+        """Build the matcher inputs for a chunk."""
+        groups = _GROUPS_ADAPTER.dump_python(timeline.timeline)
         
-        from .models import WordTimestamp
-        word_ts = [WordTimestamp(w.word, w.start, w.end) for w in chunk.words]
+        words = chunk.words
+        if all(isinstance(w, WordTimestamp) for w in words):
+            word_ts = words  # Immutable, so safe to share with the chunk
+        else:
+            word_ts = [WordTimestamp(w.word, w.start, w.end) for w in words]
+        return groups, word_ts
+    
+    def _process_chunk_sync(self, chunk, timeline):
+        """Process single chunk (blocking)."""
+        groups, word_ts = self._prepare_chunk(chunk, timeline)
+        # The matcher keeps per-call cursor state, so each chunk gets its own copy
+        return _match_chunk(copy.copy(self.matcher), groups, word_ts)
+    
+    async def process_chunk(self, chunk, timeline):
+        """Process single chunk off the event loop."""
+        return await asyncio.to_thread(self._process_chunk_sync, chunk, timeline)
+    
+    async def _match_one(self, chunk, timeline, pool: Optional[ProcessPoolExecutor] = None):
+        """Timestamp-match one chunk on a worker thread, or in the process pool if given."""
+        if pool is None:
+            return await self.process_chunk(chunk, timeline)
         
-        processed = self.matcher.process_groups(groups, word_ts)
-        return [g.model_dump() for g in processed]
+        # Matching is pure Python, so a process pool sidesteps the GIL
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            pool, _match_chunk, self.matcher, *self._prepare_chunk(chunk, timeline)
+        )
+    
+    async def _process_chunks(
+        self,
+        chunk_results: AsyncIterator[Tuple[int, Any, Any]]
+    ) -> List[List[dict]]:
+        """
+        Timestamp-match chunks as their LLM results arrive.
+        Returns processed chunks in chunk order, whatever order they completed in.
+        """
+        pool = ProcessPoolExecutor(max_workers=self.cpu_workers) if self.cpu_workers else None
+        tasks = {}
+        try:
+            async for chunk_idx, chunk, timeline in chunk_results:
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("Chunk %s result: %s", chunk_idx, timeline)
+                tasks[chunk_idx] = asyncio.ensure_future(self._match_one(chunk, timeline, pool))
+            return await asyncio.gather(*(tasks[i] for i in sorted(tasks)))
+        except BaseException:
+            for task in tasks.values():
+                task.cancel()
+            raise
+        finally:
+            await chunk_results.aclose()  # Cancels in-flight LLM work if we bailed early
+            if pool:
+                pool.shutdown(wait=False, cancel_futures=True)
     
     async def run(
         self,
@@ -56,6 +144,7 @@ class SubtitlePipeline:
         transcript_override: Optional[str] = None
     ) -> List[dict]:
         """Run with proper resource management."""
+        llm_client = AsyncLLMClient.get_or_create(**self._client_kwargs)
         try:
             # Load and chunk
             chunks = self.chunker.chunk(raw_data)
@@ -66,22 +155,19 @@ class SubtitlePipeline:
             # Choose processing method (hybrid takes precedence)
             if self.use_hybrid:
                 logger.info("Using HYBRID processing mode...")
-                chunk_results = await self.llm_client.process_chunks_hybrid(chunks, config)
+                chunk_results = _aiter_list(await llm_client.process_chunks_hybrid(chunks, config))
             elif self.use_two_step:
                 logger.info("Using TWO-STEP processing mode...")
-                chunk_results = await self.llm_client.process_chunks_two_step(chunks, config)
+                if config.mode == "batch":
+                    logger.warning("Batch mode is not supported for TWO-STEP processing; using realtime")
+                # Streamed: matching of early chunks overlaps the LLM tail
+                chunk_results = llm_client.iter_chunks_two_step(chunks, config)
             else:
                 logger.info("Using SINGLE-STEP processing mode...")
-                chunk_results = await self.llm_client.process_chunks(chunks, config)
+                chunk_results = _aiter_list(await llm_client.process_chunks(chunks, config))
 
-            print(' #########  ######### chunks #########  #########  #########  ') 
-            print(chunk_results) 
-            print(' #########  ######### chunks #########  #########  #########  ') 
-            # Process timestamps
-            processed_chunks = []
-            for chunk_idx, chunk, timeline in chunk_results:
-                processed = await self.process_chunk(chunk, timeline)
-                processed_chunks.append(processed)
+            # Process timestamps (chunks are independent)
+            processed_chunks = await self._process_chunks(chunk_results)
             
             # Merge
             final_data = self.merger.merge(processed_chunks)
@@ -92,9 +178,24 @@ class SubtitlePipeline:
             return final_data
             
         finally:
-            # Ensure cleanup
-            await self.llm_client.close()
+            # Hand the shared client back; its connection pool stays warm for the next run
+            await llm_client.release()
+    
+    @classmethod
+    async def shutdown(cls):
+        """Close the running loop's shared LLM clients; call once at app teardown."""
+        await AsyncLLMClient.shutdown()
     
     def run_sync(self, *args, **kwargs):
-        """Sync wrapper."""
-        return asyncio.run(self.run(*args, **kwargs))
\ No newline at end of file
+        """Sync wrapper (runs on uvloop when available)."""
+        async def run_once():
+            # Hold our client across the run so it can be closed once this loop's done with it
+            llm_client = AsyncLLMClient.get_or_create(**self._client_kwargs)
+            try:
+                return await self.run(*args, **kwargs)
+            finally:
+                # Shared clients are bound to this event loop, which ends here
+                await llm_client.release(close_idle=True)
+        
+        runner = uvloop.run if uvloop else asyncio.run
+        return runner(run_once())
\ No newline at end of file
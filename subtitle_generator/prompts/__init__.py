@@ -0,0 +1,46 @@
+"""
+Prompt constants for subtitle generation.
+
+The strings live in ``_static`` (interned once at import); this package only
+re-exports them so ``from subtitle_generator.prompts import X`` keeps working.
+"""
+
+from subtitle_generator.prompts._static import (
+    THREE_LINES_GROUP_DIVISION,
+    TWO_LINES_GROUP_DIVISION,
+    THREE_LINES,
+    TWO_LINES,
+    TWO_LINES_COMBINED,
+    Fade_AND_BLUR_GROUP_DIVISION,
+    COMBO,
+    NORMAL_AND_ITALIC,
+    NORMAL_AND_BOLD,
+    GRADIENT_BASE,
+    GRADIENT_BASE_ITALIC,
+    HYBRID_GROUP_DIVISION,
+    HYBRID_GROUP_DIVISION_NO_HIGHLIGHT,
+    STEP1_USER_TMPL,
+    STEP2_USER_TMPL,
+    HYBRID_STEP1_USER_TMPL,
+    SINGLE_STEP_USER_TMPL,
+)
+
+__all__ = [
+    "THREE_LINES_GROUP_DIVISION",
+    "TWO_LINES_GROUP_DIVISION",
+    "THREE_LINES",
+    "TWO_LINES",
+    "TWO_LINES_COMBINED",
+    "Fade_AND_BLUR_GROUP_DIVISION",
+    "COMBO",
+    "NORMAL_AND_ITALIC",
+    "NORMAL_AND_BOLD",
+    "GRADIENT_BASE",
+    "GRADIENT_BASE_ITALIC",
+    "HYBRID_GROUP_DIVISION",
+    "HYBRID_GROUP_DIVISION_NO_HIGHLIGHT",
+    "STEP1_USER_TMPL",
+    "STEP2_USER_TMPL",
+    "HYBRID_STEP1_USER_TMPL",
+    "SINGLE_STEP_USER_TMPL",
+]
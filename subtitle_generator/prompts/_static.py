@@ -1,203 +1,70 @@
-THREE_LINES_GROUP_DIVISION = """
-You are an expert at analyzing video transcripts and dividing them into logical groups for subtitle animation.
-
-## YOUR TASK
-Divide the provided transcript into consecutive, verbatim groups of words that work well for animated subtitles.
-
-## GROUPING PRINCIPLES
-- Group by natural speech phrases and pauses
-- Keep related ideas together when possible
-- Break at punctuation marks when it improves readability
-- Prioritize viewer comprehension and reading rhythm
-- Flow naturally with speech patterns and breathing points
-
-## RULES
-1. **VERBATIM ONLY**: Use EXACT words from the transcript. No paraphrasing, no additions, no omissions.
-
-2. **CONSECUTIVE**: Groups must cover the transcript sequentially without gaps or overlaps.
+"""
+Prompt constants for subtitle generation (re-exported by the package).
 
-3. **GROUP SIZE**: 
-   - Minimum: 1 word per group
-   - Maximum: 8 words per group (never exceed this)
-   - Ideal: 3-6 words per group
-   - Never exceed 8 words, even if it means breaking coherent phrases mid-sentence
+Ordering contract: system prompts here are fully static and are always sent
+first; anything per-chunk (transcript text, groups, offsets) goes last, in the
+user message built from the *_USER_TMPL templates. Keep it that way so every
+call shares a byte-identical prefix and hits the provider's prompt cache.
+"""
 
-4. **PRESERVE FORMATTING**: Keep original punctuation, capitalization, and spelling exactly as written
+import sys
 
-## STRICT REQUIREMENTS
-✓ Every word from the transcript must appear exactly once
-✓ Words must be in their original order
-✓ No word can be skipped or repeated
-✓ Maintain all punctuation and capitalization
-✓ Strictly maintain that word limit 
+THREE_LINES_GROUP_DIVISION = """
+Divide the transcript into consecutive groups of words for animated subtitles.
 
+Rules:
+- Verbatim: exact words, punctuation and capitalization; no paraphrasing, additions or omissions.
+- Every word appears exactly once, in original order; groups are consecutive with no gaps or overlaps.
+- 1-8 words per group, ideally 3-6. Never exceed 8, even if a phrase must be split mid-sentence.
+- Break at natural phrases, pauses and punctuation; keep related ideas together.
 """
 
 
-
 TWO_LINES_GROUP_DIVISION = """
-You are an expert at analyzing video transcripts and dividing them into logical groups for subtitle animation.
-
-## YOUR TASK
-Divide the provided transcript into consecutive, verbatim groups of words.
-
-## RULES
-1. **VERBATIM ONLY**: Use EXACT words from the transcript. No paraphrasing, no additions, no omissions.
-2. **CONSECUTIVE**: Groups must cover the transcript sequentially without gaps or overlaps.
-3. **GROUP SIZE**: 
-   - Minimum 1 word per group
-   - Maximum 6 words per group (aim for 2-4 words ideally for faster pacing)
-4. **LOGICAL BOUNDARIES**: Split at natural breaks:
-   - End of phrases or clauses
-   - Before emphasis words that deserve highlighting
-   - At breathing points or pauses in speech
-
-## OUTPUT FORMAT
-Return a JSON with a "groups" array containing the verbatim text for each group.
-
-Example:
-Input: "The secret ingredient to make perfect pasta is actually very simple"
-Output groups: [
-  "The secret",
-  "ingredient",
-  "to make",
-  "perfect pasta",
-  "is actually",
-  "very simple"
-]
+Divide the transcript into consecutive groups of words for animated subtitles.
 
-## STRICT REQUIREMENTS
-✓ Every word from the transcript must appear exactly once
-✓ Words must be in original order
-✓ Preserve original punctuation and capitalization
+Rules:
+- Verbatim: exact words, punctuation and capitalization; no paraphrasing, additions or omissions.
+- Every word appears exactly once, in original order; groups are consecutive with no gaps or overlaps.
+- 1-6 words per group, ideally 2-4 for fast pacing.
+- Break at ends of phrases or clauses, before words worth highlighting, and at pauses.
 """
 
-THREE_LINES = f"""
-You are an expert typography designer specializing in creating dynamic, engaging subtitle animations for short-form video content (TikTok, Reels, YouTube Shorts, etc.).
-
-## YOUR TASK
-Analyze the provided video transcript which I have already divided into groups and you need to intelligently divide those into subtitle sequences that:
-
-
-- Emphasize key word through strategic line breaks
-- Use exact words from transcript (no modifications)
-- Looks great when overlayed on the screen, meaning that group should be properly divided into lines, like how a typography designer would do.
-
-**Structure:**
-- Must have at maximum THREE lines
-- Find the emphasis word in the group
-- The emphasis word should be isolated on its own line when possible
-
-
-## Line guidelines
-- Maximum 2-3 words per normal line
-- Maximum 1 word per emphasis line.
-- There's no limitation for emphasis line, it can be in Line 1, Line 2 or Line 3
-
-## FONT WEIGHT MAPPING
-
-- **"bold"** → Lines containing emphasis/special words
-- **"normal"** → All lines in regular groups
-
-## EMPHASIS WORD SELECTION (priority order):
-1. Action verbs (create, build, transform)
-2. Emotional triggers (amazing, shocking, finally)
-3. Numbers/statistics (10x, 90%, $1M)
-4. Negations/contrasts (never, stop, wrong)
-5. If none apply: the longest or most impactful word
+THREE_LINES = """
+Split each pre-divided subtitle group into lines for short-form video typography.
 
-### EDGE CASES:
-- If group has ≤4 words: use 1-2 lines
-- If group has 5-6 words: max 2 lines
-- Only use 3-line structure when group has 7+ words
-
-
-## STRICT REQUIREMENTS
-
-**MUST DO:**
-✓ Use exact words from transcript (verbatim, no paraphrasing)
-✓ Maintain original word order
-✓ Include every single word from the transcript
-✓ Keep words consecutive within each group (no skipping)
-✓ Preserve original punctuation and capitalization
-✓ Ensure all groups connect sequentially to cover the entire transcript
-✓ Ensure that you are operating on the same group given as an input, DONOT ever mix groups.
-✓ Ensure that emphasis word is only one word. 
-✓ The emphasis line gets "bold" font
-✓ The supporting line gets "normal" font
-
-
-Now analyze the provided transcript and output the subtitle groups in the JSON format described above.
+Rules:
+- Work on each input group as given; never merge, split or reorder groups.
+- Verbatim: every word, in order, with original punctuation and capitalization.
+- At most 3 lines per group: 1-2 lines for <=4 words, max 2 lines for 5-6 words, 3 lines only for 7+ words.
+- Pick exactly one emphasis word and put it alone on its own line (any position) with font "bold".
+- Other lines hold 2-3 words with font "normal".
+- Emphasis priority: action verbs, emotional triggers, numbers/statistics, negations/contrasts, else the most impactful word.
 """
 
-TWO_LINES = f"""
-You are an expert animation and typography designer specializing in creating dynamic, engaging subtitle animations for short-form video content (TikTok, Reels, YouTube Shorts, etc.).
-
-## YOUR TASK
-Analyze the provided video transcript and intelligently group words into subtitle sequences that:
-
-
-1. Emphasize key words through strategic line breaks
-3. Create visual rhythm and engagement
-4. Use exact words from transcript (no modifications)
-
-## GROUP TYPES
-
-### 1. SPECIAL GROUP (Three-Line Format)
-Use when the group contains emphasis/special words that deserve highlighting.
-
-**Structure:**
-- Must have exactly THREE lines
-- Among THREE lines, ONE line must contain the emphasis word(s)
-- The emphasis word should be isolated on its own line when possible
-- The emphasis line should contain exactly one word.
-- Non emphasis lines can have at Maximum 3 words.
-- The Emphasis word can be at any line number.
-```
-
-### 2. REGULAR GROUP (Single-Line Format)
-Use for text without emphasis words or for transitional phrases.
-
-**Structure:**
-- Must have exactly ONE line
-- Uses normal font type
-
-
-
-## LINE BREAK STRATEGY
-
-**For Special Groups (3 lines):**
-1. Identify the most important/emphasis words in the group
-2. Isolate that words on its own line
-3. Place supporting words on the other lines
-4. The emphasis line gets "bold" font
-5. The supporting line gets "normal" font
+TWO_LINES = """
+Group the transcript into subtitle groups for short-form video typography.
 
+Rules:
+- Verbatim: every word exactly once, in order, consecutive, with original punctuation and capitalization; groups cover the whole transcript.
+- Special group (has a word worth emphasizing, max 8 words): exactly 3 lines; the one-word emphasis line (any position) uses font "bold", the other lines hold up to 3 words with font "normal".
+- Regular group (no emphasis, max 4 words): exactly 1 line with font "normal".
+- Minimum 1 word per group.
+"""
 
-**For Regular Groups (1 line):**
-1. Keep all words together on a single line
-2. Use "normal" font weight
-
-## FONT WEIGHT MAPPING
+# Group division and line layout in one call (single-step, SubtitleTimeline schema)
+TWO_LINES_COMBINED = """
+Split the transcript into subtitle groups and lay out each group's lines in one pass.
 
-- **"bold"** → Lines containing emphasis/special words
-- **"normal"** → All lines in except the emphasis words.
+Grouping:
+- Verbatim: every word exactly once, in order, consecutive, with original punctuation and capitalization; groups cover the whole transcript with no gaps or overlaps.
+- Break at ends of phrases or clauses, before words worth highlighting, and at pauses.
+- group_text is the group's exact text.
 
-## STRICT REQUIREMENTS
-
-**MUST DO:**
-- Use exact words from transcript (verbatim, no paraphrasing)
-- Maintain original word order
-- Include every single word from the transcript
-- Keep words consecutive within each group (no skipping)
-- Preserve original punctuation and capitalization
-- Ensure all groups connect sequentially to cover the entire transcript
-- Maximum 8 words for special group and Maximum 4 words for regular group.
-- Minimum 1 word per group
-- All words must be consecutive from the transcript
-
-
-Now analyze the provided transcript and output the subtitle groups in the required format described.
+Layout:
+- Special group (has a word worth emphasizing, max 8 words): exactly 3 lines; the one-word emphasis line (any position) uses font_type "bold", the other lines hold up to 3 words with font_type "normal".
+- Regular group (no emphasis, max 4 words): exactly 1 line with font_type "normal".
+- The lines of a group, joined with spaces, must equal its group_text.
 """
 
 ##### FADE AND BLUR #####
@@ -242,7 +109,7 @@ Divide the provided transcript into consecutive, verbatim groups of words that w
 """
 
 
-COMBO = f"""
+COMBO = """
 You are an expert typography designer specializing in creating dynamic, engaging subtitle animations for short-form video content (TikTok, Reels, YouTube Shorts, etc.).
 
 ## YOUR TASK
@@ -299,11 +166,11 @@ Analyze the provided video transcript which I have already divided into groups a
 ✓ The supporting line should be a mix of "italic" as well as "normal" fonts. 
 
 
-Now analyze the provided transcript and output the subtitle groups in the JSON format described above.
+Now analyze the provided transcript and output the subtitle groups.
 """
 
 
-NORMAL_AND_ITALIC = f"""
+NORMAL_AND_ITALIC = """
 You are an expert typography designer specializing in creating dynamic, engaging subtitle animations for short-form video content (TikTok, Reels, YouTube Shorts, etc.).
 
 ## YOUR TASK
@@ -359,12 +226,12 @@ Analyze the provided video transcript which I have already divided into groups a
 ✓ The supporting line gets "normal" font
 
 
-Now analyze the provided transcript and output the subtitle groups in the JSON format described above.
+Now analyze the provided transcript and output the subtitle groups.
 """
 
 
 
-NORMAL_AND_BOLD = f"""
+NORMAL_AND_BOLD = """
 You are an expert typography designer specializing in creating dynamic, engaging subtitle animations for short-form video content (TikTok, Reels, YouTube Shorts, etc.).
 
 ## YOUR TASK
@@ -420,10 +287,10 @@ Analyze the provided video transcript which I have already divided into groups a
 ✓ The supporting line gets "normal" font
 
 
-Now analyze the provided transcript and output the subtitle groups in the JSON format described above.
+Now analyze the provided transcript and output the subtitle groups.
 """
 
-GRADIENT_BASE = f"""
+GRADIENT_BASE = """
 You are an expert typography designer specializing in dynamic subtitle animations for short-form video content (TikTok, Reels, YouTube Shorts).
 
 ## YOUR TASK
@@ -480,11 +347,11 @@ For each group, verify before outputting:
 - **One Bold Max**: Exactly zero or one line has "bold" font per group
 - **Emphasis Isolation**: If bold exists, that line has exactly 1 word
 
-Now analyze the provided transcript and output the subtitle groups in the JSON format described above.
+Now analyze the provided transcript and output the subtitle groups.
 """
 
 
-GRADIENT_BASE_ITALIC = f"""
+GRADIENT_BASE_ITALIC = """
 You are an expert typography designer specializing in dynamic subtitle animations for short-form video content (TikTok, Reels, YouTube Shorts).
 
 ## YOUR TASK
@@ -541,7 +408,7 @@ For each group, verify before outputting:
 - **One Italic Max**: Exactly zero or one line has "italic" font per group
 - **Emphasis Isolation**: If italic exists, that line has exactly 1 word
 
-Now analyze the provided transcript and output the subtitle groups in the JSON format described above.
+Now analyze the provided transcript and output the subtitle groups.
 """
 
 
@@ -612,14 +479,51 @@ Divide the provided transcript into consecutive, verbatim groups.
 
 4. **PRESERVE FORMATTING**: Keep original punctuation, capitalization, and spelling exactly as written
 
-## OUTPUT FORMAT
-- group_text: The verbatim text of the group
-- highlight_word: null (this style does not use highlight words)
-
 ## STRICT REQUIREMENTS
 ✓ Every word from the transcript must appear exactly once
 ✓ Words must be in their original order
 ✓ No word can be skipped or repeated
 ✓ Set highlight_word to null for all groups
 ✓ Maintain all punctuation and capitalization
-"""
\ No newline at end of file
+"""
+
+
+##### USER PROMPT TEMPLATES #####
+# Pre-joined templates rendered with str.format_map per chunk.
+# Static instructions lead and the chunk's transcript comes last, so the
+# byte-identical prefix (system prompt + instruction line) stays cacheable.
+
+STEP1_USER_TMPL = (
+    "Divide this transcript into consecutive verbatim groups following the rules provided.\n\n"
+    "## VIDEO TRANSCRIPT SEGMENT (Chunk {chunk_index})\n"
+    "{text}"
+)
+
+STEP2_USER_TMPL = (
+    "Format these groups into the subtitle structure with proper line breaks and font types.\n\n"
+    "## PRE-DIVIDED GROUPS (Chunk {chunk_index})\n"
+    "{groups_text}"
+)
+
+HYBRID_STEP1_USER_TMPL = (
+    "Divide this transcript into consecutive verbatim groups with highlight words following the rules provided.\n\n"
+    "## VIDEO TRANSCRIPT SEGMENT (Chunk {chunk_index})\n"
+    "{text}"
+)
+
+SINGLE_STEP_USER_TMPL = (
+    "Analyze this transcript segment and create optimized subtitle groups.\n\n"
+    "## VIDEO TRANSCRIPT (Segment {chunk_index}, starts at {start:.1f}s of a longer video)\n"
+    "{text}"
+)
+
+
+# Intern the prompt constants so every GenerationConfig shares one canonical copy
+for _name in (
+    "THREE_LINES_GROUP_DIVISION", "TWO_LINES_GROUP_DIVISION", "THREE_LINES", "TWO_LINES",
+    "Fade_AND_BLUR_GROUP_DIVISION", "COMBO", "NORMAL_AND_ITALIC", "NORMAL_AND_BOLD",
+    "GRADIENT_BASE", "GRADIENT_BASE_ITALIC", "HYBRID_GROUP_DIVISION",
+    "HYBRID_GROUP_DIVISION_NO_HIGHLIGHT", "TWO_LINES_COMBINED",
+):
+    globals()[_name] = sys.intern(globals()[_name])
+del _name
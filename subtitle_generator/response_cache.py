@@ -0,0 +1,141 @@
+# --- response_cache.py ---
+import asyncio
+import hashlib
+import logging
+import sqlite3
+import threading
+import time
+from typing import Dict, Optional, Tuple, Type, Any, Union
+import redis.asyncio as redis
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TTL = 7 * 86400  # 7 days
+
+
+def make_cache_key(
+    model: str,
+    system_prompt: str,
+    user_prompt: str,
+    response_format: Optional[Type[Any]] = None
+) -> str:
+    """Content-addressed key for an LLM call; identical inputs map to the same entry."""
+    format_name = response_format.__name__ if response_format else ""
+    digest = hashlib.blake2b(digest_size=32)
+    for part in (model, system_prompt, user_prompt, format_name):
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\x00")
+    return digest.hexdigest()
+
+
+class RedisResponseCache:
+    """Cache raw LLM completions in Redis so retried/replayed batches skip the API."""
+
+    def __init__(self, url: str, ttl: int = DEFAULT_TTL, prefix: str = "llm:"):
+        self.client = redis.Redis.from_url(url, decode_responses=False)
+        self.ttl = ttl
+        self.prefix = prefix
+
+    async def get(self, key: str) -> Optional[bytes]:
+        """Return cached completion bytes, or None on miss or backend failure."""
+        try:
+            return await self.client.get(self.prefix + key)
+        except redis.RedisError as e:
+            logger.warning("Response cache read failed: %s", e)
+            return None
+
+    async def set(self, key: str, value: bytes):
+        """Store completion bytes; failures are logged, never raised."""
+        try:
+            await self.client.set(self.prefix + key, value, ex=self.ttl)
+        except redis.RedisError as e:
+            logger.warning("Response cache write failed: %s", e)
+
+    async def close(self):
+        """Cleanup resources."""
+        await self.client.aclose()
+
+
+class SqliteResponseCache:
+    """Local, zero-config alternative to Redis: completions in a WAL-mode SQLite file."""
+
+    def __init__(self, path: str, ttl: int = DEFAULT_TTL):
+        self.ttl = ttl
+        self._lock = threading.Lock()  # One connection shared by worker threads
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses "
+            "(key TEXT PRIMARY KEY, value BLOB NOT NULL, expires_at REAL NOT NULL)"
+        )
+
+    def _get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM responses WHERE key = ? AND expires_at > ?",
+                (key, time.time())
+            ).fetchone()
+        return row[0] if row else None
+
+    def _set(self, key: str, value: bytes):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, value, time.time() + self.ttl)
+            )
+
+    async def get(self, key: str) -> Optional[bytes]:
+        """Return cached completion bytes, or None on miss, expiry or backend failure."""
+        try:
+            return await asyncio.to_thread(self._get, key)
+        except sqlite3.Error as e:
+            logger.warning("Response cache read failed: %s", e)
+            return None
+
+    async def set(self, key: str, value: bytes):
+        """Store completion bytes; failures are logged, never raised."""
+        try:
+            await asyncio.to_thread(self._set, key, value)
+        except sqlite3.Error as e:
+            logger.warning("Response cache write failed: %s", e)
+
+    async def close(self):
+        """Cleanup resources."""
+        self._conn.close()
+
+
+def open_response_cache(
+    url: str,
+    ttl: int = DEFAULT_TTL
+) -> Union[RedisResponseCache, SqliteResponseCache]:
+    """Build a response cache from a URL: sqlite:///path/to/file.db or redis://..."""
+    if url.startswith("sqlite://"):
+        return SqliteResponseCache(url[len("sqlite://"):], ttl=ttl)
+    return RedisResponseCache(url, ttl=ttl)
+
+
+# Caches opened by get_response_cache, shared by every run in the process
+_SHARED_CACHES: Dict[Tuple[str, int], Union[RedisResponseCache, SqliteResponseCache]] = {}
+
+
+def get_response_cache(
+    url: str,
+    ttl: int = DEFAULT_TTL
+) -> Union[RedisResponseCache, SqliteResponseCache]:
+    """
+    Process-wide cache for (url, ttl), opened on first use. Reusing one instance keeps
+    the shared LLM client (keyed by its cache) and its connection pool warm across runs.
+    Close with close_response_caches() at teardown.
+    """
+    key = (url, ttl)
+    cache = _SHARED_CACHES.get(key)
+    if cache is None:
+        cache = _SHARED_CACHES[key] = open_response_cache(url, ttl=ttl)
+    return cache
+
+
+async def close_response_caches():
+    """Close every cache opened by get_response_cache (app teardown)."""
+    while _SHARED_CACHES:
+        _, cache = _SHARED_CACHES.popitem()
+        await cache.close()
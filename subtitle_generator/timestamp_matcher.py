@@ -1,170 +1,48 @@
 
-# # --- timestamp_matcher.py ---
-# import re
-# import logging
-# from typing import List, Tuple, Optional
-# from subtitle_generator.models import WordTimestamp, ProcessedGroup, ProcessedLine
-
-# logger = logging.getLogger(__name__)
-
-
-# class TimestampMatcher:
-#     """Aligns generated subtitle groups with original word timestamps."""
-    
-#     @staticmethod
-#     def normalize_word(word: str) -> str:
-#         """Remove punctuation and normalize for matching."""
-#         return re.sub(r'[^\w\s]', '', word.lower()).strip()
-    
-#     def find_phrase_timestamp(
-#         self, 
-#         phrase: str, 
-#         word_timestamps: List[WordTimestamp],
-#         search_start: Optional[float] = None,
-#         search_end: Optional[float] = None
-#     ) -> Tuple[float, float]:
-#         """
-#         Find start and end timestamps for a phrase within optional time bounds.
-#         """
-#         phrase_words = [
-#             self.normalize_word(w) 
-#             for w in re.findall(r"[A-Za-z0-9]+(?:'[A-Za-z0-9]+)?", phrase)
-#             if self.normalize_word(w)
-#         ]
-        
-#         if not phrase_words:
-#             return (0.0, 0.0)
-        
-#         transcript_words = [self.normalize_word(w.word) for w in word_timestamps]
-        
-#         for i in range(len(transcript_words) - len(phrase_words) + 1):
-#             if transcript_words[i:i+len(phrase_words)] == phrase_words:
-#                 start_time = word_timestamps[i].start
-#                 end_time = word_timestamps[i + len(phrase_words) - 1].end
-                
-#                 # Check bounds if specified
-#                 if search_start is not None and start_time < search_start:
-#                     continue
-#                 if search_end is not None and end_time > search_end:
-#                     continue
-                    
-#                 return (start_time, end_time)
-        
-#         return (0.0, 0.0)
-    
-#     def get_word_timestamps(
-#         self, 
-#         line_text: str, 
-#         word_timestamps: List[WordTimestamp],
-#         line_start: float,
-#         line_end: float
-#     ) -> List[dict]:
-#         """Get individual word timestamps for a line."""
-#         line_words = re.findall(r"[A-Za-z0-9]+(?:'[A-Za-z0-9]+)?", line_text)
-#         normalized_line_words = [self.normalize_word(w) for w in line_words]
-#         transcript_words = [self.normalize_word(w.word) for w in word_timestamps]
-        
-#         word_details = []
-        
-#         for i in range(len(transcript_words) - len(normalized_line_words) + 1):
-#             if transcript_words[i:i+len(normalized_line_words)] == normalized_line_words:
-#                 match_start = word_timestamps[i].start # error here, check properly
-#                 match_end = word_timestamps[i + len(normalized_line_words) - 1].end
-                
-#                 # Ensure match falls within parent group's time range
-#                 if match_start >= line_start and match_end <= line_end:
-#                     for j, original_word in enumerate(line_words):
-#                         wt = word_timestamps[i + j]
-#                         word_details.append({
-#                             'word': original_word,
-#                             'start': wt.start,
-#                             'end': wt.end,
-#                             'id': f'word-{i+j}'  # Temporary ID, reassigned later
-#                         })
-#                     return word_details
-        
-#         return []
-    
-#     def process_groups(
-#         self, 
-#         groups: List[dict], 
-#         word_timestamps: List[WordTimestamp]
-#     ) -> List[ProcessedGroup]:
-#         """
-#         Add timestamps to groups, lines, and words.
-#         """
-#         processed = []
-        
-#         for idx, group_data in enumerate(groups):
-#             group_text = group_data.get('group_text', '')
-            
-#             # Get group-level timestamps
-#             start, end = self.find_phrase_timestamp(group_text, word_timestamps)
-            
-#             if (start, end) == (0.0, 0.0):
-#                 logger.warning(f"Missing timestamp for group {idx}: '{group_text}'")
-            
-#             processed_lines = []
-#             for line_data in group_data.get('lines', []):
-#                 line_text = line_data.get('text', '')
-#                 font_type = line_data.get('font_type', 'normal')
-                
-#                 # Get line timestamps within group bounds
-#                 line_start, line_end = self.find_phrase_timestamp(
-#                     line_text, word_timestamps, start, end
-#                 )
-                
-#                 # Get word-level timestamps
-#                 word_details = self.get_word_timestamps(
-#                     line_text, word_timestamps, line_start, line_end
-#                 )
-                
-#                 processed_lines.append(ProcessedLine(
-#                     text=line_text,
-#                     font_type=font_type,
-#                     start=line_start,
-#                     end=line_end,
-#                     words=word_details
-#                 ))
-            
-#             processed.append(ProcessedGroup(
-#                 id=f"group-{idx}",
-#                 group_text=group_text,
-#                 start=start,
-#                 end=end,
-#                 lines=processed_lines
-#             ))
-        
-#         return processed
-    
-#     def assign_ids(self, groups: List[ProcessedGroup]) -> List[dict]:
-#         """Assign hierarchical IDs to groups, lines, and words."""
-#         result = []
-        
-#         for g_idx, group in enumerate(groups):
-#             group_dict = group.model_dump()
-#             group_dict['id'] = f"group-{g_idx}"
-            
-#             for l_idx, line in enumerate(group_dict['lines']):
-#                 line['id'] = f"group-{g_idx}-line-{l_idx}"
-                
-#                 for w_idx, word in enumerate(line.get('words', [])):
-#                     word['id'] = f"group-{g_idx}-line-{l_idx}-word-{w_idx}"
-            
-#             result.append(group_dict)
-        
-#         return result
-
-
-
 # --- timestamp_matcher.py (Fixed with sequential matching) ---
 import re
+import string
 import logging
-from typing import List, Tuple, Optional, Dict
-from subtitle_generator.models import WordTimestamp, ProcessedGroup, ProcessedLine
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+from functools import lru_cache
+from typing import Any, Iterable, Iterator, List, Tuple, Optional, Dict
+from subtitle_generator.models import WordTimestamp, WordOut, ProcessedGroup, ProcessedLine
 
 logger = logging.getLogger(__name__)
 
+# Compiled once; the matcher runs this per word
+_PUNCT_RE = re.compile(r'[^\w\s]')
+# Stripped from the ends of output words ("Hello," -> "Hello")
+_EDGE_PUNCT = string.punctuation + "\u201c\u201d\u2018\u2019\u00ab\u00bb\u2014\u2013\u2026"
+
+
+def _kmp_search(pattern: List[Any], text: List[Any], start: int = 0, end: Optional[int] = None) -> int:
+    """Index of the first occurrence of pattern in text[start:end], or -1 (O(N+M))."""
+    m = len(pattern)
+    if m == 0:
+        return start
+    
+    # Failure table: length of the longest proper prefix that is also a suffix
+    lps = [0] * m
+    k = 0
+    for i in range(1, m):
+        while k and pattern[i] != pattern[k]:
+            k = lps[k - 1]
+        if pattern[i] == pattern[k]:
+            k += 1
+        lps[i] = k
+    
+    j = 0
+    for i in range(start, len(text) if end is None else min(end, len(text))):
+        while j and text[i] != pattern[j]:
+            j = lps[j - 1]
+        if text[i] == pattern[j]:
+            j += 1
+            if j == m:
+                return i - m + 1
+    return -1
+
 
 class TimestampMatcher:
     """Aligns generated subtitle groups with original word timestamps using sequential matching."""
@@ -172,70 +50,147 @@ class TimestampMatcher:
     def __init__(self):
         self.word_cursor = 0  # Track position in word_timestamps
         self.word_timestamps: List[WordTimestamp] = []
+        # Normalized tokens interned to ints: matching compares ints, not strings
+        self._vocab: Dict[str, int] = {}
+        self._transcript_ids: List[int] = []  # Index-aligned with word_timestamps
+        self._bigram_index: Dict[Tuple[int, int], List[int]] = {}  # Adjacent-ID pair -> start indices
+        # Struct-of-arrays copies of the timestamps for the hot loops
+        self._starts: List[float] = []
+        self._ends: List[float] = []
     
     @staticmethod
+    @lru_cache(maxsize=8192)  # Zipfian vocabulary: most calls repeat a few hundred words
     def normalize_word(word: str) -> str:
         """Remove punctuation and normalize for matching."""
-        return re.sub(r'[^\w\s]', '', word.lower()).strip()
+        return _PUNCT_RE.sub('', word.lower()).strip()
     
     def reset_cursor(self):
         """Reset cursor for new processing session."""
         self.word_cursor = 0
     
+    def set_word_timestamps(self, word_timestamps: List[WordTimestamp]):
+        """Install the transcript to match against, normalizing its words once."""
+        self.word_timestamps = word_timestamps
+        vocab: Dict[str, int] = {}
+        self._transcript_ids = [
+            vocab.setdefault(self.normalize_word(w.word), len(vocab)) for w in word_timestamps
+        ]
+        self._vocab = vocab
+        self._starts = [w.start for w in word_timestamps]
+        self._ends = [w.end for w in word_timestamps]
+        
+        index = defaultdict(list)
+        for i, pair in enumerate(zip(self._transcript_ids, self._transcript_ids[1:])):
+            index[pair].append(i)
+        self._bigram_index = dict(index)
+    
+    def _phrase_ids(self, phrase_words: List[str]) -> List[int]:
+        """Map normalized phrase tokens to transcript IDs; -1 (never matches) if unseen."""
+        vocab = self._vocab
+        return [vocab.get(w, -1) for w in phrase_words]
+    
+    def _find_phrase(self, phrase_ids: List[int], start: int = 0, stop: Optional[int] = None) -> int:
+        """First index in [start, stop) where phrase_ids occurs in the transcript, or -1."""
+        if len(phrase_ids) < 2:
+            end = None if stop is None else stop + len(phrase_ids) - 1
+            return _kmp_search(phrase_ids, self._transcript_ids, start, end)
+        
+        # Only positions where the phrase's first bigram occurs can match
+        candidates = self._bigram_index.get((phrase_ids[0], phrase_ids[1]))
+        if not candidates:
+            return -1
+        transcript_ids = self._transcript_ids
+        m = len(phrase_ids)
+        last = len(transcript_ids) - m
+        hi = len(candidates) if stop is None else bisect_left(candidates, stop)
+        for k in range(bisect_left(candidates, start), hi):
+            i = candidates[k]
+            if i > last:
+                break
+            # The first two tokens already match; compare the rest in place, stopping at
+            # the first mismatch instead of allocating a window slice per candidate
+            if all(transcript_ids[i + j] == phrase_ids[j] for j in range(2, m)):
+                return i
+        return -1
+    
+    def _tokenize(self, text: str) -> Tuple[List[str], List[str]]:
+        """Split text into (original, normalized) tokens, dropping tokens that normalize to nothing."""
+        # Whitespace split matches how transcript words are delimited ("well-known",
+        # "U.S." stay one token) and skips the regex automaton
+        words, normalized = [], []
+        for w in text.split():
+            n = self.normalize_word(w)
+            if n:
+                words.append(w)
+                normalized.append(n)
+        return words, normalized
+    
+    def _normalize_phrase(self, phrase: str) -> List[str]:
+        """Tokenize and normalize a phrase, dropping tokens that normalize to nothing."""
+        return [n for w in phrase.split() if (n := self.normalize_word(w))]
+    
     def find_phrase_timestamp_sequential(
         self, 
         phrase: str,
-        search_start_idx: int = 0
+        search_start_idx: int = 0,
+        phrase_words: Optional[List[str]] = None
     ) -> Tuple[float, float, int, int]:
         """
         Find start and end timestamps for a phrase starting from search_start_idx.
+        Pass phrase_words (normalized tokens) when the caller already tokenized phrase.
         Returns: (start_time, end_time, start_idx, end_idx) in word_timestamps
         """
-        phrase_words = [
-            self.normalize_word(w) 
-            for w in re.findall(r"\w+(?:'\w+)?", phrase, re.UNICODE)
-            if self.normalize_word(w)
-        ]
+        if phrase_words is None:
+            phrase_words = self._normalize_phrase(phrase)
         
         if not phrase_words:
             return (0.0, 0.0, search_start_idx, search_start_idx)
         
-        transcript_words = [self.normalize_word(w.word) for w in self.word_timestamps]
-        
         # Search only from search_start_idx onwards (sequential matching)
-        for i in range(search_start_idx, len(transcript_words) - len(phrase_words) + 1):
-            if transcript_words[i:i+len(phrase_words)] == phrase_words:
-                start_time = self.word_timestamps[i].start
-                end_time = self.word_timestamps[i + len(phrase_words) - 1].end
-                return (start_time, end_time, i, i + len(phrase_words) - 1)
+        phrase_ids = self._phrase_ids(phrase_words)
+        if -1 in phrase_ids:
+            # A token the transcript never contains: neither scan below can match
+            logger.error("Could not find phrase: '%s' anywhere in transcript", phrase)
+            return (0.0, 0.0, search_start_idx, search_start_idx)
         
-        # Fallback: if not found sequentially, try full search but warn
-        for i in range(len(transcript_words) - len(phrase_words) + 1):
-            if transcript_words[i:i+len(phrase_words)] == phrase_words:
-                start_time = self.word_timestamps[i].start
-                end_time = self.word_timestamps[i + len(phrase_words) - 1].end
-                logger.warning(
-                    f"Phrase '{phrase}' found at index {i} but expected after {search_start_idx}. "
-                    f"Possible duplicate or out-of-order match."
-                )
-                return (start_time, end_time, i, i + len(phrase_words) - 1)
+        # One pass over the transcript: forward from the cursor, then wrap around to the
+        # positions before it (the fallback), so no position is examined twice
+        i = self._find_phrase(phrase_ids, search_start_idx)
+        if i < 0:
+            i = self._find_phrase(phrase_ids, 0, search_start_idx)
+            if i < 0:
+                logger.error("Could not find phrase: '%s' anywhere in transcript", phrase)
+                return (0.0, 0.0, search_start_idx, search_start_idx)
+            logger.warning(
+                "Phrase '%s' found at index %d but expected after %d. "
+                "Possible duplicate or out-of-order match.",
+                phrase, i, search_start_idx
+            )
         
-        logger.error(f"Could not find phrase: '{phrase}' anywhere in transcript")
-        return (0.0, 0.0, search_start_idx, search_start_idx)
+        end_idx = i + len(phrase_ids) - 1
+        return (self._starts[i], self._ends[end_idx], i, end_idx)
     
     def process_groups(
         self, 
-        groups: List[dict], 
+        groups: Iterable[dict], 
         word_timestamps: List[WordTimestamp]
     ) -> List[ProcessedGroup]:
+        """Materialized iter_process_groups, for callers that need the whole list."""
+        return list(self.iter_process_groups(groups, word_timestamps))
+    
+    def iter_process_groups(
+        self, 
+        groups: Iterable[dict], 
+        word_timestamps: List[WordTimestamp]
+    ) -> Iterator[ProcessedGroup]:
         """
         Add timestamps to groups, lines, and words using sequential matching.
         Each group starts searching from where the previous group ended.
+        Yields groups one at a time; only the cursor is carried between them.
         """
-        self.word_timestamps = word_timestamps
+        self.set_word_timestamps(word_timestamps)
         self.reset_cursor()
         
-        processed = []
         current_search_idx = 0  # Track position in word_timestamps
         
         for idx, group_data in enumerate(groups):
@@ -244,46 +199,64 @@ class TimestampMatcher:
             # Get group-level timestamps starting from current position
             start, end, start_idx, end_idx = self.find_phrase_timestamp_sequential(
                 group_text, 
-                search_start_idx=current_search_idx
+                search_start_idx=current_search_idx,
+                phrase_words=self._normalize_phrase(group_text)
             )
             
             if (start, end) == (0.0, 0.0):
-                logger.warning(f"Missing timestamp for group {idx}: '{group_text}'")
+                logger.warning("Missing timestamp for group %d: '%s'", idx, group_text)
             else:
                 # Advance cursor to after this group (with small overlap tolerance)
                 current_search_idx = end_idx + 1
-                logger.debug(f"Group {idx}: '{group_text[:30]}...' -> indices {start_idx}-{end_idx}")
+                logger.debug("Group %d: '%.30s...' -> indices %d-%d", idx, group_text, start_idx, end_idx)
             
             processed_lines = []
             line_search_idx = start_idx  # Lines search within group bounds
+            group_found = (start, end) != (0.0, 0.0)
             
             for line_data in group_data.get('lines', []):
                 line_text = line_data.get('text', '')
                 font_type = line_data.get('font_type', 'normal')
                 
-                # Get line timestamps within group bounds (sequential within group)
-                line_start, line_end, line_start_idx, line_end_idx = self.find_phrase_timestamp_sequential(
-                    line_text, 
-                    search_start_idx=line_search_idx
-                )
-                
-                # Ensure line is within group bounds
-                if line_start < start:
-                    logger.warning(f"Line '{line_text}' matched before group start. Constraining to group bounds.")
-                    line_start = start
-                if line_end > end:
-                    logger.warning(f"Line '{line_text}' matched after group end. Constraining to group bounds.")
-                    line_end = end
+                # Tokenized once; the search and word extraction below reuse both lists
+                line_words, line_norm = self._tokenize(line_text)
                 
-                # Advance line cursor
-                if line_end_idx > line_search_idx:
+                # Lines partition their group in order, so each one normally starts right
+                # at the cursor: check that span directly instead of searching for it
+                line_ids = self._phrase_ids(line_norm)
+                n = len(line_ids)
+                if group_found and n and self._transcript_ids[line_search_idx:line_search_idx + n] == line_ids:
+                    line_start_idx = line_search_idx
+                    line_end_idx = line_search_idx + n - 1
+                    line_start = self._starts[line_start_idx]
+                    line_end = self._ends[line_end_idx]
                     line_search_idx = line_end_idx + 1
+                else:
+                    # Get line timestamps within group bounds (sequential within group)
+                    line_start, line_end, line_start_idx, line_end_idx = self.find_phrase_timestamp_sequential(
+                        line_text, 
+                        search_start_idx=line_search_idx,
+                        phrase_words=line_norm
+                    )
+                    
+                    # Ensure line is within group bounds
+                    if line_start < start:
+                        logger.warning("Line '%s' matched before group start. Constraining to group bounds.", line_text)
+                        line_start = start
+                    if line_end > end:
+                        logger.warning("Line '%s' matched after group end. Constraining to group bounds.", line_text)
+                        line_end = end
+                    
+                    # Advance line cursor
+                    if line_end_idx > line_search_idx:
+                        line_search_idx = line_end_idx + 1
                 
                 # Get word-level timestamps
                 word_details = self.get_word_timestamps_sequential(
                     line_text, 
                     line_start_idx, 
-                    line_end_idx
+                    line_end_idx,
+                    line_words=line_words
                 )
                 
                 processed_lines.append(ProcessedLine(
@@ -294,48 +267,45 @@ class TimestampMatcher:
                     words=word_details
                 ))
             
-            processed.append(ProcessedGroup(
+            yield ProcessedGroup(
                 id=f"group-{idx}",
                 group_text=group_text,
                 start=start,
                 end=end,
                 lines=processed_lines
-            ))
-        
-        return processed
+            )
     
     def get_word_timestamps_sequential(
         self, 
         line_text: str,
         start_idx: int,
-        end_idx: int
-    ) -> List[dict]:
-        """Extract word timestamps for a line given its start/end indices."""
+        end_idx: int,
+        line_words: Optional[List[str]] = None
+    ) -> List[WordOut]:
+        """
+        Extract word timestamps for a line given its start/end indices.
+        line_words: the line's original tokens from _tokenize, if already split.
+        """
         if start_idx < 0 or end_idx >= len(self.word_timestamps) or start_idx > end_idx:
-            logger.warning(f"Invalid indices for word extraction: {start_idx}-{end_idx}")
+            logger.warning("Invalid indices for word extraction: %s-%s", start_idx, end_idx)
             return []
         
-        line_words = re.findall(r"\w+(?:'\w+)?", line_text, re.UNICODE)
+        # Same tokens as the phrase search, so positions line up with the matched indices
+        if line_words is None:
+            line_words = self._tokenize(line_text)[0]
         
-        word_details = []
-        for i, word in enumerate(line_words):
-            word_idx = start_idx + i
-            if word_idx > end_idx:
-                logger.warning(f"More words in line '{line_text}' than matched indices")
-                break
-            
-            if word_idx < len(self.word_timestamps):
-                wt = self.word_timestamps[word_idx]
-                word_details.append({
-                    'word': word,
-                    'start': wt.start,
-                    'end': wt.end,
-                    'id': f'word-{word_idx}'
-                })
+        n = end_idx - start_idx + 1
+        if len(line_words) > n:
+            logger.warning("More words in line '%s' than matched indices", line_text)
+            line_words = line_words[:n]
         
-        return word_details
+        # Local aliases keep attribute lookups out of the per-word loop
+        starts, ends = self._starts, self._ends
+        return [
+            WordOut(word.strip(_EDGE_PUNCT), starts[word_idx], ends[word_idx], 'word-' + str(word_idx))
+            for word_idx, word in enumerate(line_words, start_idx)
+        ]
     
-    # Keep old methods for backward compatibility (but mark as deprecated)
     def find_phrase_timestamp(
         self, 
         phrase: str, 
@@ -344,80 +314,60 @@ class TimestampMatcher:
         search_end: Optional[float] = None
     ) -> Tuple[float, float]:
         """
-        DEPRECATED: Use find_phrase_timestamp_sequential instead.
-        Find start and end timestamps for a phrase within optional time bounds.
+        Backward-compatible shim over the indexed search: first match of phrase whose
+        timestamps fall within the optional time bounds, or (0.0, 0.0).
         """
-        phrase_words = [
-            self.normalize_word(w) 
-            for w in re.findall(r"\w+(?:'\w+)?", phrase, re.UNICODE)
-            if self.normalize_word(w)
-        ]
+        if word_timestamps is not self.word_timestamps:
+            self.set_word_timestamps(word_timestamps)
         
+        phrase_words = self._normalize_phrase(phrase)
         if not phrase_words:
             return (0.0, 0.0)
         
-        transcript_words = [self.normalize_word(w.word) for w in word_timestamps]
+        phrase_ids = self._phrase_ids(phrase_words)
+        last = len(phrase_ids) - 1
         
-        for i in range(len(transcript_words) - len(phrase_words) + 1):
-            if transcript_words[i:i+len(phrase_words)] == phrase_words:
-                start_time = word_timestamps[i].start
-                end_time = word_timestamps[i + len(phrase_words) - 1].end
-                
-                if search_start is not None and start_time < search_start:
-                    continue
-                if search_end is not None and end_time > search_end:
-                    continue
-                    
-                return (start_time, end_time)
+        # Timestamps are chronological, so the time bounds become an index window:
+        # start >= search_start  <=>  i >= lo;  end <= search_end  <=>  i < hi
+        lo = 0 if search_start is None else bisect_left(self._starts, search_start)
+        hi = len(self._starts) if search_end is None else bisect_right(self._ends, search_end) - last
         
+        i = self._find_phrase(phrase_ids, lo)
+        if 0 <= i < hi:
+            return (self._starts[i], self._ends[i + last])
         return (0.0, 0.0)
     
-    def get_word_timestamps(
-        self, 
-        line_text: str, 
-        word_timestamps: List[WordTimestamp],
-        line_start: float,
-        line_end: float
-    ) -> List[dict]:
-        """DEPRECATED: Use get_word_timestamps_sequential instead."""
-        line_words = re.findall(r"\w+(?:'\w+)?", line_text, re.UNICODE)
-        normalized_line_words = [self.normalize_word(w) for w in line_words]
-        transcript_words = [self.normalize_word(w.word) for w in word_timestamps]
-        
-        word_details = []
-        
-        for i in range(len(transcript_words) - len(normalized_line_words) + 1):
-            if transcript_words[i:i+len(normalized_line_words)] == normalized_line_words:
-                match_start = word_timestamps[i].start
-                match_end = word_timestamps[i + len(normalized_line_words) - 1].end
-                
-                if match_start >= line_start and match_end <= line_end:
-                    for j, original_word in enumerate(line_words):
-                        wt = word_timestamps[i + j]
-                        word_details.append({
-                            'word': original_word,
-                            'start': wt.start,
-                            'end': wt.end,
-                            'id': f'word-{i+j}'
-                        })
-                    return word_details
-        
-        return []
-    
-    def assign_ids(self, groups: List[ProcessedGroup]) -> List[dict]:
+    def assign_ids(self, groups: Iterable[ProcessedGroup]) -> List[dict]:
         """Assign hierarchical IDs to groups, lines, and words."""
         result = []
         
+        # Build the dicts directly from attributes instead of a recursive model_dump()
         for g_idx, group in enumerate(groups):
-            group_dict = group.model_dump()
-            group_dict['id'] = f"group-{g_idx}"
-            
-            for l_idx, line in enumerate(group_dict['lines']):
-                line['id'] = f"group-{g_idx}-line-{l_idx}"
-                
-                for w_idx, word in enumerate(line.get('words', [])):
-                    word['id'] = f"group-{g_idx}-line-{l_idx}-word-{w_idx}"
+            # Each ID prefix is built once and extended by concatenation
+            group_id = "group-" + str(g_idx)
+            lines_out = []
+            for l_idx, line in enumerate(group.lines):
+                line_id = group_id + "-line-" + str(l_idx)
+                word_prefix = line_id + "-word-"
+                words_out = [
+                    {'word': word.word, 'start': word.start, 'end': word.end, 'id': word_prefix + str(w_idx)}
+                    for w_idx, word in enumerate(line.words)
+                ]
+                lines_out.append({
+                    'text': line.text,
+                    'font_type': line.font_type,
+                    'start': line.start,
+                    'end': line.end,
+                    'words': words_out,
+                    'id': line_id,
+                })
             
-            result.append(group_dict)
+            result.append({
+                'group_text': group.group_text,
+                'lines': lines_out,
+                'id': group_id,
+                'start': group.start,
+                'end': group.end,
+            })
         
         return result
\ No newline at end of file
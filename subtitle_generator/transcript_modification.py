@@ -1,6 +1,10 @@
 # subtitle_generator/transcript_modification.py
 import os
 import logging
+import dataclasses
+from subtitle_generator.config import PromptRegistry
+from subtitle_generator.pipeline import SubtitlePipeline
+from subtitle_generator.response_cache import get_response_cache
 
 logging.basicConfig(
     level=logging.INFO,
@@ -10,22 +14,31 @@ logging.basicConfig(
 
 # Update subtitle_generator/transcript_modification.py
 
-async def apply_styles(raw_data, style):
-    """Async version - call with await"""
+async def apply_styles(raw_data, style, render_key=None):
+    """Async version - call with await. Pass a stable render_key (e.g. video id) to speed up re-renders."""
     api_key = os.getenv("OPENAI_API_KEY")
     if not api_key:
         raise ValueError("API key required via --api-key or OPENAI_API_KEY env var")
     
-    from subtitle_generator.config import PromptRegistry
-    from subtitle_generator.pipeline import SubtitlePipeline
-    
     config = PromptRegistry.get_config(style)
+    if render_key:
+        # Previous outputs (the predictions) live in the response cache, so keyed runs need one
+        config = dataclasses.replace(config, render_key=render_key, enable_cache=True)
+
+    response_cache = None
+    if config.enable_cache:
+        cache_url = config.cache_url or os.getenv("REDIS_URL", "redis://localhost:6379/0")
+        response_cache = get_response_cache(cache_url, ttl=config.cache_ttl)  # Shared, not closed per run
+
     pipeline = SubtitlePipeline(
         api_key=api_key,
         model=config.model,
         max_chunk_duration=config.max_chunk,
         max_concurrent=config.max_concurrent,
-        use_hybrid=config.use_hybrid  # Pass through
+        use_hybrid=config.use_hybrid,  # Pass through
+        use_two_step=config.use_two_step,
+        response_cache=response_cache,
+        base_url=config.base_url
     )
     
     # Call pipeline.run directly (already async)
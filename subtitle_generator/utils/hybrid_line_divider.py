@@ -2,6 +2,7 @@
 import re
 import logging
 import random
+from functools import lru_cache
 from typing import List, Dict, Optional, Tuple, Any
 from subtitle_generator.models import (
     GroupWithHighlight, 
@@ -13,6 +14,15 @@ from subtitle_generator.models import (
 
 logger = logging.getLogger(__name__)
 
+# Compiled once; per-call re.sub pays a pattern-cache lookup on every word
+_NON_WORD_RE = re.compile(r'[^\w]')
+
+
+@lru_cache(maxsize=8192)  # Shared across groups and divisions; transcript vocabulary repeats
+def _normalize(word: str) -> str:
+    """Lowercase and drop every non-word character, for punctuation-insensitive matching."""
+    return _NON_WORD_RE.sub('', word.lower())
+
 
 class HybridLineDivider:
     """
@@ -24,6 +34,11 @@ class HybridLineDivider:
     def __init__(self, max_words_per_line: int = 3, font_config: Optional[FontConfig] = None):
         self.max_words = max_words_per_line
         self.font_config = font_config or FontConfig()  # Default to normal only
+        # FontConfig is frozen, so its answers can be resolved once per divider
+        self._use_hl = self.font_config.should_use_highlight()
+        self._hl_font = self.font_config.get_highlight_font()
+        self._sup_fonts = self.font_config.get_supporting_fonts()
+        self._n_sup = len(self._sup_fonts)
         random.seed()  # Initialize random for font selection
     
     def divide_group(self, group: GroupWithHighlight) -> SubtitleGroup:
@@ -32,196 +47,173 @@ class HybridLineDivider:
         """
         text = group.group_text
         highlight = group.highlight_word
+        # Split text into words preserving order (reusing the post-processor's split)
+        words = group._words or text.split()
 
         # Check if this style actually uses highlight words
         # If not, treat as normal group without highlight separation
-        if not self.font_config.should_use_highlight():
-            return self._divide_without_highlight(text)
+        if not self._use_hl:
+            return self._divide_without_highlight(text, words)
         
         # If no highlight or highlight not in text, treat as normal group
         if not highlight or highlight not in text:
-            return self._divide_without_highlight(text)
-        
-        # Split text into words preserving order
-        words = text.split()
+            return self._divide_without_highlight(text, words)
         
-        # Find highlight position
+        # Find highlight position: verbatim match first, then punctuation-insensitive,
+        # cleaning words only until the first match
         try:
-            clean_words = [self._clean_word(w) for w in words]
-            clean_highlight = self._clean_word(highlight)
-            highlight_idx = clean_words.index(clean_highlight)
+            highlight_idx = words.index(highlight)
         except ValueError:
+            clean_highlight = _normalize(highlight)
+            highlight_idx = -1
+            for i, w in enumerate(words):
+                if _normalize(w) == clean_highlight:
+                    highlight_idx = i
+                    break
+        if highlight_idx < 0:
             logger.warning(f"Highlight word '{highlight}' not found in '{text}'")
-            return self._divide_without_highlight(text)
+            return self._divide_without_highlight(text, words)
         
         # Split into before and after highlight
         before_words = words[:highlight_idx]
         after_words = words[highlight_idx + 1:]
         
-        # Build lines
+        # Build lines as (text, font_type) pairs; SubtitleLine models are only
+        # built once merging is done
         lines = []
         
         # Get fonts from config
-        highlight_font = self.font_config.get_highlight_font()
-        supporting_fonts = self.font_config.get_supporting_fonts()  # Get list of available supporting fonts
+        highlight_font = self._hl_font
+        supporting_fonts = self._sup_fonts  # List of available supporting fonts
         
         # Handle before highlight - split into chunks of max_words
         # Alternate between available supporting fonts
-        if before_words:
-            before_chunks = self._chunk_words(before_words, self.max_words)
-            for i, chunk in enumerate(before_chunks):
-                # Cycle through supporting fonts: 0, 1, 0, 1, etc.
-                font_idx = i % len(supporting_fonts)
-                lines.append(SubtitleLine(
-                    text=" ".join(chunk),
-                    font_type=supporting_fonts[font_idx]
-                ))
+        max_words = self.max_words
+        n_fonts = self._n_sup
+        for i, start in enumerate(range(0, len(before_words), max_words)):
+            # Cycle through supporting fonts: 0, 1, 0, 1, etc.
+            lines.append((" ".join(before_words[start:start + max_words]), supporting_fonts[i % n_fonts]))
         
         # Add highlight line with configured highlight font (bold or italic)
-        lines.append(SubtitleLine(
-            text=highlight,
-            font_type=highlight_font
-        ))
+        lines.append((highlight, highlight_font))
         
         # Handle after highlight - split into chunks of max_words
         # Continue alternating pattern from where we left off
-        if after_words:
-            after_chunks = self._chunk_words(after_words, self.max_words)
-            start_idx = len(before_chunks) % len(supporting_fonts) if before_words else 0
-            for i, chunk in enumerate(after_chunks):
-                font_idx = (start_idx + i) % len(supporting_fonts)
-                lines.append(SubtitleLine(
-                    text=" ".join(chunk),
-                    font_type=supporting_fonts[font_idx]
-                ))
+        start_idx = len(lines) - 1
+        for i, start in enumerate(range(0, len(after_words), max_words)):
+            lines.append((" ".join(after_words[start:start + max_words]), supporting_fonts[(start_idx + i) % n_fonts]))
         
         # Ensure we don't exceed 3 lines total
         lines = self._optimize_lines(lines, supporting_fonts)
         
         return SubtitleGroup(
             group_text=text,
-            lines=lines
+            lines=[SubtitleLine(text=line_text, font_type=font) for line_text, font in lines]
         )
     
-    def _clean_word(self, word: str) -> str:
-        """Remove punctuation for matching."""
-        return re.sub(r'[^\w\s]', '', word.lower()).strip()
-    
-    def _chunk_words(self, words: List[str], max_size: int) -> List[List[str]]:
-        """Split word list into chunks of max_size."""
-        if not words:
-            return []
-        
-        chunks = []
-        current_chunk = []
-        
-        for word in words:
-            if len(current_chunk) >= max_size:
-                chunks.append(current_chunk)
-                current_chunk = []
-            current_chunk.append(word)
-        
-        if current_chunk:
-            chunks.append(current_chunk)
-        
-        return chunks
-    
-    def _divide_without_highlight(self, text: str) -> SubtitleGroup:
+    def _divide_without_highlight(self, text: str, words: Optional[List[str]] = None) -> SubtitleGroup:
         """Divide group without highlight word (all supporting fonts)."""
-        words = text.split()
-        
-        # Simple chunking
-        chunks = self._chunk_words(words, self.max_words)
-        
-        supporting_fonts = self.font_config.get_supporting_fonts()
-        
-        # Alternate between supporting fonts
-        lines = []
-        for i, chunk in enumerate(chunks):
-            font_idx = i % len(supporting_fonts)
-            lines.append(SubtitleLine(
-                text=" ".join(chunk), 
-                font_type=supporting_fonts[font_idx]
-            ))
+        if words is None:
+            words = text.split()
+        max_words = self.max_words
+        
+        supporting_fonts = self._sup_fonts
+        n_fonts = self._n_sup
+        
+        # Simple chunking, alternating between supporting fonts
+        lines = [
+            SubtitleLine(
+                text=" ".join(words[start:start + max_words]),
+                font_type=supporting_fonts[i % n_fonts]
+            )
+            for i, start in enumerate(range(0, len(words), max_words))
+        ]
         
         return SubtitleGroup(group_text=text, lines=lines)
     
-    def _optimize_lines(self, lines: List[SubtitleLine], supporting_fonts: List[str]) -> List[SubtitleLine]:
+    def _optimize_lines(self, lines: List[Tuple[str, str]], supporting_fonts: List[str]) -> List[Tuple[str, str]]:
         """
-        Ensure we have at most 3 lines.
+        Ensure we have at most 3 (text, font_type) lines.
         If more than 3, merge supporting lines intelligently while alternating fonts.
         """
         if len(lines) <= 3:
             return lines
         
         # Find highlight line index
-        highlight_font = self.font_config.get_highlight_font()
+        highlight_font = self._hl_font
         highlight_idx = None
         
-        for i, line in enumerate(lines):
-            if line.font_type == highlight_font:
+        for i, (_, font) in enumerate(lines):
+            if font == highlight_font:
                 highlight_idx = i
                 break
         
         if highlight_idx is None:
             # No highlight found, just take first 3 chunks with alternating fonts
-            result = []
-            for i in range(min(3, len(lines))):
-                font_idx = i % len(supporting_fonts)
-                result.append(SubtitleLine(text=lines[i].text, font_type=supporting_fonts[font_idx]))
-            return result
-        
-        # Strategy: Keep highlight line, merge others
-        before = lines[:highlight_idx]
-        highlight = lines[highlight_idx]
-        after = lines[highlight_idx + 1:]
-        
-        # Merge strategy: reduce to max 1 line before and 1 line after
-        while len(before) > 1 and len(after) > 1:
-            if len(before) >= len(after):
-                # Merge last two before lines - use the font of the first one to maintain alternation pattern
-                merged_text = before[-2].text + " " + before[-1].text
-                before[-2] = SubtitleLine(text=merged_text, font_type=before[-2].font_type)
-                before.pop(-1)
-            else:
-                # Merge first two after lines
-                merged_text = after[0].text + " " + after[1].text
-                after[0] = SubtitleLine(text=merged_text, font_type=after[0].font_type)
-                after.pop(1)
-        
-        # If still over 3 lines, merge all extras into adjacent lines
-        while len(before) + 1 + len(after) > 3:
-            if len(before) > 1:
-                # Merge last two before
-                merged_text = before[-2].text + " " + before[-1].text
-                before[-2] = SubtitleLine(text=merged_text, font_type=before[-2].font_type)
-                before.pop(-1)
-            elif len(after) > 1:
-                # Merge first two after
-                merged_text = after[0].text + " " + after[1].text
-                after[0] = SubtitleLine(text=merged_text, font_type=after[0].font_type)
-                after.pop(1)
-            else:
-                break
+            n_fonts = len(supporting_fonts)
+            return [(lines[i][0], supporting_fonts[i % n_fonts]) for i in range(min(3, len(lines)))]
+        
+        if len(lines) == 4:
+            # Common case, one merge: the two supporting lines next to the
+            # highlight on its longer side (what the general loops below pick)
+            j = highlight_idx + 1 if highlight_idx <= 1 else highlight_idx - 2
+            result = lines[:j] + [(lines[j][0] + " " + lines[j + 1][0], lines[j][1])] + lines[j + 2:]
+        else:
+            # Strategy: Keep highlight line, merge others
+            before = lines[:highlight_idx]
+            highlight = lines[highlight_idx]
+            after = lines[highlight_idx + 1:]
+        
+            # Merges only ever fold the before lines nearest the highlight into one,
+            # and likewise the after lines, so settle the final counts first...
+            n_before, n_after = len(before), len(after)
+        
+            # Merge strategy: reduce to max 1 line before and 1 line after
+            while n_before > 1 and n_after > 1:
+                if n_before >= n_after:
+                    n_before -= 1
+                else:
+                    n_after -= 1
+        
+            # If still over 3 lines, merge all extras into adjacent lines
+            while n_before + 1 + n_after > 3:
+                if n_before > 1:
+                    n_before -= 1
+                elif n_after > 1:
+                    n_after -= 1
+                else:
+                    break
+        
+            # ...then join each merged run once, keeping the font of its first line
+            # to maintain the alternation pattern
+            if n_before < len(before):
+                tail = before[n_before - 1:]
+                before = before[:n_before - 1]
+                before.append((" ".join(line_text for line_text, _ in tail), tail[0][1]))
+            if n_after < len(after):
+                head_len = len(after) - n_after + 1
+                after[:head_len] = [(" ".join(line_text for line_text, _ in after[:head_len]), after[0][1])]
+            
+            result = before + [highlight] + after
         
         # Ensure alternating fonts for final result if we have 2 supporting lines
-        result = before + [highlight] + after
         if len(result) == 3 and len(supporting_fonts) >= 2:
             # Check if both supporting lines have same font
-            supporting_indices = [i for i, line in enumerate(result) if line.font_type != highlight_font]
+            supporting_indices = [i for i, (_, font) in enumerate(result) if font != highlight_font]
             if len(supporting_indices) == 2:
                 idx1, idx2 = supporting_indices
-                if result[idx1].font_type == result[idx2].font_type:
+                if result[idx1][1] == result[idx2][1]:
                     # They have same font, change second one to alternate
-                    current_font = result[idx1].font_type
+                    current_font = result[idx1][1]
                     alternate_font = supporting_fonts[1] if current_font == supporting_fonts[0] else supporting_fonts[0]
-                    result[idx2] = SubtitleLine(text=result[idx2].text, font_type=alternate_font)
+                    result[idx2] = (result[idx2][0], alternate_font)
         
         return result
     
     def divide_groups(self, groups: List[GroupWithHighlight]) -> List[SubtitleGroup]:
         """Process multiple groups."""
-        return [self.divide_group(g) for g in groups]
+        divide_group = self.divide_group  # Bound once, not per group
+        return [divide_group(g) for g in groups]
 
 
 class HybridPostProcessor:
@@ -235,45 +227,44 @@ class HybridPostProcessor:
     
     def process(
         self, 
-        division: 'GroupDivisionWithHighlights'
+        division: GroupDivisionWithHighlights
     ) -> List[GroupWithHighlight]:
         """
         Split oversized groups and assign highlight words correctly.
+        When nothing needs splitting, division.groups itself is returned.
         """
-        from subtitle_generator.models import GroupDivisionWithHighlights
+        groups = division.groups
+        max_words = self.max_words
+        result = None  # Only copied once the first oversized group shows up
         
-        result = []
-        
-        for group in division.groups:
-            word_count = len(group.group_text.split())
+        for i, group in enumerate(groups):
+            words = group.group_text.split()
             
-            if word_count <= self.max_words:
-                result.append(group)
+            if len(words) <= max_words:
+                group._words = words  # Reused by HybridLineDivider.divide_group
+                if result is not None:
+                    result.append(group)
             else:
+                if result is None:
+                    result = groups[:i]
                 # Split and distribute highlight
-                split_groups = self._split_group_with_highlight(group)
+                split_groups = self._split_group_with_highlight(group, words)
                 result.extend(split_groups)
         
-        return result
+        return groups if result is None else result
     
     def _split_group_with_highlight(
         self, 
-        group: GroupWithHighlight
+        group: GroupWithHighlight,
+        words: Optional[List[str]] = None
     ) -> List[GroupWithHighlight]:
         """
         Split oversized group and determine which part gets the highlight.
         """
-        words = group.group_text.split()
+        if words is None:
+            words = group.group_text.split()
         highlight = group.highlight_word
         
-        # Find highlight position
-        try:
-            clean_words = [re.sub(r'[^\w]', '', w.lower()) for w in words]
-            clean_highlight = re.sub(r'[^\w]', '', highlight.lower()) if highlight else ""
-            highlight_idx = clean_words.index(clean_highlight) if clean_highlight else -1
-        except ValueError:
-            highlight_idx = -1
-        
         # Calculate split point
         total_words = len(words)
         mid_point = total_words // 2
@@ -281,12 +272,42 @@ class HybridPostProcessor:
         # Adjust split to not break in middle of a potential highlight
         split_point = mid_point
         
+        # One pass: highlight position (cleaning words only until it is found),
+        # the longest word of each half (first one winning ties like max())
+        # and each half's character count
+        clean_highlight = _normalize(highlight) if highlight else ""
+        highlight_idx = -1
+        longest = [None, None]
+        longest_len = [-1, -1]
+        chars = [0, 0]
+        for i, w in enumerate(words):
+            half = i >= split_point
+            n = len(w)
+            chars[half] += n
+            if n > longest_len[half]:
+                longest_len[half] = n
+                longest[half] = w
+            if highlight_idx < 0 and clean_highlight and _normalize(w) == clean_highlight:
+                highlight_idx = i
+        
         # Split words
         first_half = words[:split_point]
         second_half = words[split_point:]
         
-        first_text = " ".join(first_half)
-        second_text = " ".join(second_half)
+        text = group.group_text
+        if (
+            0 < split_point < total_words
+            and len(text) == chars[0] + chars[1] + total_words - 1
+            and text.count(" ") == total_words - 1
+        ):
+            # Already single-space separated (no tabs/newlines): slice the original
+            # around the split point instead of re-joining both halves
+            offset = chars[0] + split_point - 1
+            first_text = text[:offset]
+            second_text = text[offset + 1:]
+        else:
+            first_text = " ".join(first_half)
+            second_text = " ".join(second_half)
         
         # Determine which half gets the highlight
         first_highlight = None
@@ -297,33 +318,30 @@ class HybridPostProcessor:
             first_highlight = highlight
             # Try to find a secondary highlight in second half (longest word)
             if len(second_half) > 1:
-                second_highlight = max(second_half, key=len)
+                second_highlight = longest[1]
         elif highlight_idx >= split_point:
             # Highlight is in second half
             second_highlight = highlight
             # Try to find secondary in first half
             if len(first_half) > 1:
-                first_highlight = max(first_half, key=len)
+                first_highlight = longest[0]
         else:
             # No highlight found, assign longest words
             if len(first_half) > 1:
-                first_highlight = max(first_half, key=len)
+                first_highlight = longest[0]
             if len(second_half) > 1:
-                second_highlight = max(second_half, key=len)
+                second_highlight = longest[1]
         
         result = []
         
-        if first_half:
-            result.append(GroupWithHighlight(
-                group_text=first_text,
-                highlight_word=first_highlight
-            ))
-        
-        if second_half:
-            result.append(GroupWithHighlight(
-                group_text=second_text,
-                highlight_word=second_highlight
-            ))
+        for half, half_text, half_highlight in (
+            (first_half, first_text, first_highlight),
+            (second_half, second_text, second_highlight),
+        ):
+            if half:
+                part = GroupWithHighlight(group_text=half_text, highlight_word=half_highlight)
+                part._words = half
+                result.append(part)
         
         return result
     
@@ -332,4 +350,5 @@ class HybridPostProcessor:
         divisions: List['GroupDivisionWithHighlights']
     ) -> List[List[GroupWithHighlight]]:
         """Process multiple divisions (one per chunk)."""
-        return [self.process(d) for d in divisions]
\ No newline at end of file
+        process = self.process  # Bound once, not per division
+        return [process(d) for d in divisions]
\ No newline at end of file
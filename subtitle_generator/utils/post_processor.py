@@ -1,10 +1,37 @@
 # --- post_processor.py (New file) ---
 import logging
-from typing import List
+import re
+from typing import List, Tuple
 from subtitle_generator.models import GroupDivision
 
 logger = logging.getLogger(__name__)
 
+# Whitespace following clause punctuation; "3.5" or "U.S." stay intact
+_CLAUSE_BREAK = re.compile(r'(?<=[.?!,;])\s+')
+
+
+def _compute_splits(word_count: int, max_words: int) -> List[Tuple[int, int]]:
+    """
+    (start, end) word ranges splitting word_count words into the fewest
+    near-equal chunks of <= max_words.
+    """
+    # Calculate how many groups we need
+    # e.g., 12 words with limit 8 -> 2 groups of 6 each
+    # e.g., 15 words with limit 8 -> 2 groups (7 and 8) or 3 groups of 5 each
+    num_groups = (word_count + max_words - 1) // max_words  # Ceiling division
+    
+    # Calculate base size and remainder for even distribution
+    base_size, remainder = divmod(word_count, num_groups)
+    
+    spans = []
+    start = 0
+    for i in range(num_groups):
+        # Distribute remainder across first 'remainder' groups
+        end = start + base_size + (i < remainder)
+        spans.append((start, end))
+        start = end
+    return spans
+
 
 class GroupPostProcessor:
     """
@@ -60,30 +87,7 @@ class GroupPostProcessor:
             List of text chunks, each within word limit
         """
         words = text.split()
-        
-        # Calculate how many groups we need
-        # e.g., 12 words with limit 8 -> 2 groups of 6 each
-        # e.g., 15 words with limit 8 -> 2 groups (7 and 8) or 3 groups of 5 each
-        num_groups = (word_count + self.max_words - 1) // self.max_words  # Ceiling division
-        
-        # Calculate base size and remainder for even distribution
-        base_size = word_count // num_groups
-        remainder = word_count % num_groups
-        
-        result = []
-        start_idx = 0
-        
-        for i in range(num_groups):
-            # Distribute remainder across first 'remainder' groups
-            chunk_size = base_size + (1 if i < remainder else 0)
-            
-            chunk_words = words[start_idx:start_idx + chunk_size]
-            chunk_text = " ".join(chunk_words)
-            result.append(chunk_text)
-            
-            start_idx += chunk_size
-        
-        return result
+        return [" ".join(words[start:end]) for start, end in _compute_splits(word_count, self.max_words)]
     
     def process_divisions(self, divisions: List[GroupDivision]) -> List[GroupDivision]:
         """
@@ -95,4 +99,36 @@ class GroupPostProcessor:
         Returns:
             List of processed GroupDivisions
         """
-        return [self.process(d) for d in divisions]
\ No newline at end of file
+        process = self.process  # Bound once, not per division
+        return [process(d) for d in divisions]
+
+
+def divide_groups(text: str, max_words: int = 6) -> List[str]:
+    """
+    Rule-based step 1: split a transcript into verbatim groups of <= max_words,
+    breaking at punctuation. Deterministic stand-in for the *_GROUP_DIVISION LLM call.
+    """
+    groups: List[str] = []
+    current: List[str] = []
+    
+    for clause in _CLAUSE_BREAK.split(text.strip()):
+        words = clause.split()
+        if not words:
+            continue
+        
+        # Pack short clauses together, but never across a sentence end
+        if current and len(current) + len(words) <= max_words and current[-1][-1] not in '.?!':
+            current.extend(words)
+            continue
+        
+        if current:
+            groups.append(" ".join(current))
+        if len(words) <= max_words:
+            current = words
+        else:
+            groups.extend(" ".join(words[start:end]) for start, end in _compute_splits(len(words), max_words))
+            current = []
+    
+    if current:
+        groups.append(" ".join(current))
+    return groups
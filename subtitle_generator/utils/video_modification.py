@@ -1,8 +1,10 @@
-from pydub import AudioSegment
 import time
 import ffmpeg
 import os
 import logging
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, partial
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
@@ -10,7 +12,7 @@ logger = logging.getLogger(__name__)
 
 def convert_mp4_to_mp3(input_path, output_path=None, bitrate="192k", max_retries=3, retry_delay=2):
     """
-    Convert MP4 to MP3 using pydub with retry logic
+    Convert MP4 to MP3 with ffmpeg, with retry logic
     Outputs 16kHz mono MP3
     
     Args:
@@ -32,21 +34,25 @@ def convert_mp4_to_mp3(input_path, output_path=None, bitrate="192k", max_retries
         try:
             logger.info(f"Attempt {attempt}/{max_retries}: Converting {input_path} to {output_path}")
             
-            # Load audio
-            audio = AudioSegment.from_file(input_path, format="mp4")
+            if not os.path.exists(input_path):
+                raise FileNotFoundError(input_path)
             
-            # Convert to mono
-            audio = audio.set_channels(1)
-            
-            # Set sample rate to 16kHz
-            audio = audio.set_frame_rate(16000)
-            
-            # Export with specified settings
-            audio.export(
-                output_path, 
-                format="mp3",
-                bitrate=bitrate,
-                parameters=["-q:a", "2"]  # VBR quality
+            # ffmpeg downmixes and resamples frame by frame, so the decoded
+            # audio never has to fit in memory
+            (
+                ffmpeg
+                .input(input_path)
+                .output(
+                    output_path,
+                    format="mp3",
+                    vn=None,  # Drop the video stream
+                    ac=1,  # Mono
+                    ar=16000,  # 16kHz
+                    audio_bitrate=bitrate,
+                    **{"q:a": 2}  # VBR quality
+                )
+                .overwrite_output()
+                .run(quiet=True)
             )
             
             logger.info(f"Conversion successful: {output_path} (16kHz mono)")
@@ -57,7 +63,9 @@ def convert_mp4_to_mp3(input_path, output_path=None, bitrate="192k", max_retries
             return output_path  # Don't retry if file doesn't exist
             
         except Exception as e:
-            logger.warning(f"Attempt {attempt} failed: {e}")
+            # quiet=True captures ffmpeg's stderr onto the error; surface it
+            stderr = getattr(e, "stderr", None)
+            logger.warning(f"Attempt {attempt} failed: {stderr.decode(errors='replace') if stderr else e}")
             
             if attempt < max_retries:
                 logger.info(f"Retrying in {retry_delay} seconds...")
@@ -84,7 +92,32 @@ if __name__ == "__main__":
         print("✗ Conversion failed after all retries")
 
 
-def convert_video_lowres(input_file, output_file=None, target_height=360):
+# Hardware H.264 encoders, in order of preference
+_HW_ENCODERS = ("h264_nvenc", "h264_videotoolbox", "h264_qsv")
+
+
+@lru_cache(maxsize=None)
+def _pick_encoder():
+    """
+    Best H.264 encoder this ffmpeg build offers; probed once per process.
+    Builds can list a hardware encoder without the device being present,
+    so this is opt-in via convert_video_lowres(encoder=None).
+    """
+    try:
+        listing = subprocess.run(
+            ["ffmpeg", "-hide_banner", "-encoders"],
+            capture_output=True, text=True, check=True
+        ).stdout
+    except (OSError, subprocess.CalledProcessError) as e:
+        logger.warning(f"Could not list ffmpeg encoders, using libx264: {e}")
+        return "libx264"
+    
+    available = {line.split()[1] for line in listing.splitlines() if len(line.split()) > 1}
+    return next((enc for enc in _HW_ENCODERS if enc in available), "libx264")
+
+
+def convert_video_lowres(input_file, output_file=None, target_height=360,
+                         encoder="libx264", preset="veryfast", crf=23, threads=None):
     """
     Converts a video to a specified vertical resolution (height) while keeping aspect ratio and audio.
     
@@ -93,6 +126,10 @@ def convert_video_lowres(input_file, output_file=None, target_height=360):
         output_file (str, optional): Path to save the converted video. 
                                      If None, adds '_{target_height}p' to the input filename.
         target_height (int): Desired height in pixels (e.g., 360 for 360p, 480 for 480p).
+        encoder (str, optional): H.264 encoder; None picks a hardware encoder when ffmpeg has one.
+        preset (str): libx264 speed preset.
+        crf (int): libx264 constant rate factor (quality).
+        threads (int, optional): ffmpeg -threads; None lets ffmpeg use every core.
     """
     if not os.path.exists(input_file):
         raise FileNotFoundError(f"Input file not found: {input_file}")
@@ -101,15 +138,23 @@ def convert_video_lowres(input_file, output_file=None, target_height=360):
         base, ext = os.path.splitext(input_file)
         output_file = f"{base}_{target_height}p{ext}"
     
+    if encoder is None:
+        encoder = _pick_encoder()
+    
+    # preset/crf are libx264 options; hardware encoders keep their own defaults
+    encoder_opts = {"preset": preset, "crf": crf} if encoder == "libx264" else {}
+    if threads is not None:
+        encoder_opts["threads"] = threads
+    
     try:
         # Build the scale filter dynamically based on target height
         scale_filter = f"scale=-2:{target_height}"
         
-        # Run ffmpeg conversion
+        # Run ffmpeg conversion; scaling doesn't touch the audio, so copy it as-is
         (
             ffmpeg
             .input(input_file)
-            .output(output_file, vf=scale_filter, vcodec='libx264', acodec='aac', strict='experimental')
+            .output(output_file, vf=scale_filter, vcodec=encoder, acodec='copy', **encoder_opts)
             .run(overwrite_output=True)
         )
         print(f"Video successfully converted to {target_height}p: {output_file}")
@@ -119,14 +164,51 @@ def convert_video_lowres(input_file, output_file=None, target_height=360):
         raise
 
 
+def convert_videos_lowres(input_files, target_height=360, workers=4, threads=1, **kwargs):
+    """
+    convert_video_lowres over many files, several ffmpeg runs at a time.
+    Threads suffice since the work happens in the ffmpeg subprocesses; threads=1
+    per run leaves core scheduling to the OS. Returns output paths in input order.
+    """
+    convert = partial(convert_video_lowres, target_height=target_height, threads=threads, **kwargs)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(convert, input_files))
+
+
+def convert_many_mp4_to_mp3(input_paths, workers=4, **kwargs):
+    """convert_mp4_to_mp3 over many files concurrently; returns output paths in input order."""
+    convert = partial(convert_mp4_to_mp3, **kwargs)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(convert, input_paths))
+
+
+@lru_cache(maxsize=128)
+def _probe(video_path, mtime, size):
+    """ffprobe a file; mtime/size in the key drop stale entries when the file changes."""
+    return ffmpeg.probe(video_path)
+
+
+def _parse_frame_rate(rate):
+    """ffprobe "30000/1001"-style rate to a float; None when missing or "0/0"."""
+    try:
+        num, den = map(int, rate.split('/'))
+    except (AttributeError, ValueError):
+        return None
+    return num / den if num and den else None
+
+
 def get_video_info(video_path):
-    probe = ffmpeg.probe(video_path)
+    st = os.stat(video_path)
+    probe = _probe(video_path, st.st_mtime, st.st_size)
     video_info = next(s for s in probe['streams'] if s['codec_type'] == 'video')
 
     width = int(video_info['width'])
     height = int(video_info['height'])
-    video_info = next(s for s in probe['streams'] if s['codec_type'] == 'video')
     duration = float(video_info['duration'])
-    fps = 30
+    fps = (
+        _parse_frame_rate(video_info.get('avg_frame_rate'))
+        or _parse_frame_rate(video_info.get('r_frame_rate'))
+        or 30.0  # Previous hard-coded value, for streams that report no rate
+    )
 
-    return width, height, duration, fps
\ No newline at end of file
+    return width, height, duration, fps
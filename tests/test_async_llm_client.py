@@ -0,0 +1,149 @@
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+import httpx
+from tenacity import wait_none
+
+from subtitle_generator import async_llm_client
+from subtitle_generator.async_llm_client import AsyncLLMClient
+from subtitle_generator.config import GenerationConfig
+from subtitle_generator.models import GroupDivision
+
+_REQUEST = httpx.Request("POST", "https://api.openai.com/v1/chat/completions")
+
+
+def _chunk(content=None, finish_reason=None):
+    return SimpleNamespace(
+        choices=[SimpleNamespace(finish_reason=finish_reason, delta=SimpleNamespace(content=content))]
+    )
+
+
+class MemoryCache:
+    """In-memory stand-in for the Redis/SQLite response caches."""
+
+    def __init__(self):
+        self.data = {}
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def set(self, key, value):
+        self.data[key] = value
+
+    async def close(self):
+        pass
+
+
+class FakeStream:
+    """Chat completion stream that yields `chunks`, then optionally raises `error`."""
+
+    def __init__(self, chunks, error=None):
+        self.response = SimpleNamespace(request=_REQUEST)
+        self._chunks = chunks
+        self._error = error
+        self.closed = False
+
+    async def __aiter__(self):
+        for chunk in self._chunks:
+            yield chunk
+        if self._error is not None:
+            raise self._error
+
+    async def close(self):
+        self.closed = True
+
+
+def _make_client(**kwargs) -> AsyncLLMClient:
+    return AsyncLLMClient(
+        api_key="test-key",
+        requests_per_minute=None,
+        tokens_per_minute=None,
+        **kwargs
+    )
+
+
+class StreamTransportErrorTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.client = _make_client()
+        self.addAsyncCleanup(self.client.close)
+        # No backoff sleeps between attempts
+        patcher = mock.patch.object(async_llm_client, "wait_random_exponential", lambda **_: wait_none())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    async def test_mid_stream_read_error_is_retried(self):
+        streams = [
+            FakeStream([_chunk('{"a": ')], httpx.ReadError("connection reset")),
+            FakeStream([_chunk('{"a": '), _chunk("1}"), _chunk(finish_reason="stop")]),
+        ]
+        create = mock.AsyncMock(side_effect=streams)
+        self.client.client.chat.completions.create = create
+
+        result = await self.client.generate("system", "user")
+
+        self.assertEqual(result, '{"a": 1}')
+        self.assertEqual(create.await_count, 2)
+        self.assertTrue(all(stream.closed for stream in streams))
+
+    async def test_mid_stream_read_timeout_gives_up_after_max_retries(self):
+        create = mock.AsyncMock(side_effect=lambda **_: FakeStream([], httpx.ReadTimeout("slow")))
+        self.client.client.chat.completions.create = create
+
+        with self.assertRaises(async_llm_client.openai.APITimeoutError):
+            await self.client.generate("system", "user")
+        self.assertEqual(create.await_count, self.client.max_retries)
+
+
+class PredictedOutputTest(unittest.IsolatedAsyncioTestCase):
+    async def test_second_render_sends_previous_output_as_prediction(self):
+        client = _make_client(model="gpt-4.1", response_cache=MemoryCache())
+        self.addAsyncCleanup(client.close)
+        config = GenerationConfig(name="test", model="gpt-4.1", render_key="42", output_tokens_per_word=16)
+        first = '{"groups":["hello world"]}'
+        create = mock.AsyncMock(side_effect=[
+            FakeStream([_chunk(first), _chunk(finish_reason="stop")]),
+            FakeStream([_chunk('{"groups":["hello there world"]}'), _chunk(finish_reason="stop")]),
+        ])
+        client.client.chat.completions.create = create
+
+        for text in ("hello world", "hello there world"):  # Re-render after a transcript edit
+            await client._generate_routed(
+                text,
+                config,
+                system_prompt="divide",
+                user_prompt=text,
+                response_format=GroupDivision,
+                chunk_id=0
+            )
+
+        first_call, second_call = (call.kwargs for call in create.await_args_list)
+        self.assertNotIn("prediction", first_call)
+        self.assertIn("max_completion_tokens", first_call)
+        self.assertEqual(second_call["prediction"], {"type": "content", "content": first})
+        self.assertNotIn("max_completion_tokens", second_call)
+
+    async def test_unsupported_model_gets_no_prediction(self):
+        client = _make_client(model="gpt-5.1", response_cache=MemoryCache())
+        self.addAsyncCleanup(client.close)
+        config = GenerationConfig(name="test", render_key="42")
+        create = mock.AsyncMock(side_effect=lambda **_: FakeStream(
+            [_chunk('{"groups":["hello world"]}'), _chunk(finish_reason="stop")]
+        ))
+        client.client.chat.completions.create = create
+
+        for text in ("hello world", "hello there world"):
+            await client._generate_routed(
+                text,
+                config,
+                system_prompt="divide",
+                user_prompt=text,
+                response_format=GroupDivision,
+                chunk_id=0
+            )
+
+        self.assertTrue(all("prediction" not in call.kwargs for call in create.await_args_list))
+
+
+if __name__ == "__main__":
+    unittest.main()